@@ -4,6 +4,7 @@ BTC 自动交易系统 — 用户 API
 用户信息、交易所配置、交易数据接口。
 """
 
+from dataclasses import asdict
 from typing import Any
 
 from fastapi import APIRouter, HTTPException, status
@@ -261,7 +262,7 @@ async def get_positions(user: CurrentActiveUser) -> dict[str, Any]:
         
         return {
             "success": True,
-            "data": {"positions": [p.__dict__ for p in positions]},
+            "data": {"positions": [asdict(p) for p in positions]},
             "timestamp": utc_now().isoformat(),
         }
     finally:
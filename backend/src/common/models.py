@@ -99,7 +99,7 @@ class ExecutionResult(BaseModel):
     slippage: float = 0.0
     commission: float = 0.0
     timestamp: datetime = Field(default_factory=utc_now)
-    flags: list[str] = Field(default_factory=list)
+    flags: tuple[str, ...] = ()
 
 
 # ============================================================
@@ -46,6 +46,19 @@ def from_utc_ms(ts_ms: int) -> datetime:
     return datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc)
 
 
+def from_utc_ns(ts_ns: int) -> datetime:
+    """
+    将 UTC 纳秒时间戳转换为 datetime
+    
+    Args:
+        ts_ns: UTC 纳秒时间戳（time.time_ns()）
+    
+    Returns:
+        带时区信息的 UTC datetime
+    """
+    return datetime.fromtimestamp(ts_ns / 1e9, tz=timezone.utc)
+
+
 def to_utc_ms(dt: datetime) -> int:
     """
     将 datetime 转换为 UTC 毫秒时间戳
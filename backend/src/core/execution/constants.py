@@ -43,3 +43,11 @@ class ExecutionConstants:
     
     # API 限流（每分钟）
     API_RATE_LIMIT: int = 1200
+    
+    # 执行日志环形缓冲容量
+    MAX_LOG_ENTRIES: int = 10000
+    # 按订单索引的日志：最多跟踪的订单数、每个订单保留的条目数
+    MAX_TRACKED_ORDER_LOGS: int = 1000
+    MAX_LOG_ENTRIES_PER_ORDER: int = 32
+    # 待输出标准日志的积压高水位，超过后丢弃 INFO 日志
+    LOG_QUEUE_HIGH_WATERMARK: int = 4096
@@ -5,10 +5,12 @@ BTC 自动交易系统 — 执行引擎
 """
 
 import asyncio
+import contextlib
+import logging
 from dataclasses import dataclass
 from typing import Any
 
-from src.common.enums import OrderStatus, SystemState
+from src.common.enums import OrderSide, OrderStatus, SystemState
 from src.common.exceptions import (
     ArchitectureViolationError,
     ExecutionError,
@@ -30,14 +32,24 @@ from .position_manager import PositionManager
 
 logger = get_logger(__name__)
 
+# 订单方向 -> 持仓方向
+_SIDE_TO_DIRECTION: dict[OrderSide, str] = {
+    OrderSide.BUY: "long",
+    OrderSide.SELL: "short",
+}
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class HighTradingWindowContext:
-    """高交易窗口上下文"""
+    """
+    高交易窗口上下文
+    
+    不可变：更新时整体替换引用，读取方取一次引用即可获得一致快照，无需加锁。
+    """
     is_active: bool = False
     confidence: float = 0.0
     multiplier: float = 1.0  # 仓位放大系数
-    supporting_witnesses: list[str] | None = None
+    supporting_witnesses: tuple[str, ...] = ()
     direction: str | None = None
 
 
@@ -54,11 +66,17 @@ class ExecutionEngine:
     # 高交易窗口置信度阈值
     HIGH_WINDOW_CONFIDENCE_THRESHOLD = 0.7
     
+    # 执行结果标记（共享常量，避免每单分配）
+    _EMPTY_FLAGS: tuple[str, ...] = ()
+    _HW_FLAGS: tuple[str, ...] = ("HIGH_WINDOW_APPLIED",)
+    
     def __init__(
         self,
         exchange: ExchangeManager,
         state_service: StateMachineService,
         risk_engine: RiskControlEngine | None = None,
+        single_producer: bool = False,
+        order_shards: int = 1,
     ):
         self.exchange = exchange
         self.state_service = state_service
@@ -70,11 +88,20 @@ class ExecutionEngine:
         
         self._frozen = False
         self._freeze_reason: str | None = None
-        self._lock = asyncio.Lock()
+        # 执行锁按交易对分片：不同分片的订单可并发执行，同一交易对始终串行。
+        # 单生产者模式（只有一个协程提交订单）无需加锁；nullcontext 支持 async with
+        if order_shards < 1:
+            raise ValueError(f"order_shards 必须 >= 1: {order_shards}")
+        self._shard_locks: list[asyncio.Lock | contextlib.nullcontext] = [
+            contextlib.nullcontext() if single_producer else asyncio.Lock()
+            for _ in range(order_shards)
+        ]
         self._executed_orders: set[str] = set()  # 幂等性
+        self._allowed_states = state_service.get_allowed_trading_states()
         
         # 高交易窗口上下文
         self._high_window_context = HighTradingWindowContext()
+        self._hw_active_and_scaling = False  # 快速路径标志：窗口激活且放大系数 > 1
     
     @property
     def is_frozen(self) -> bool:
@@ -101,16 +128,26 @@ class ExecutionEngine:
             is_active=is_active,
             confidence=confidence,
             multiplier=multiplier,
-            supporting_witnesses=supporting_witnesses or [],
+            supporting_witnesses=tuple(supporting_witnesses or ()),
             direction=direction,
         )
+        self._hw_active_and_scaling = is_active and multiplier > 1.0
         
         if is_active:
             logger.info(
-                f"高交易窗口激活: 置信度={confidence:.2%}, 放大系数={multiplier}x",
+                "高交易窗口激活: 置信度=%.2f%%, 放大系数=%sx",
+                confidence * 100,
+                multiplier,
                 extra={"confidence": confidence, "multiplier": multiplier},
             )
     
+    def _lock_for(self, symbol: str) -> asyncio.Lock | contextlib.nullcontext:
+        """获取交易对所在分片的执行锁"""
+        locks = self._shard_locks
+        if len(locks) == 1:
+            return locks[0]
+        return locks[hash(symbol) % len(locks)]
+    
     def get_position_multiplier(self) -> float:
         """获取当前仓位放大系数"""
         return self._high_window_context.multiplier
@@ -121,38 +158,34 @@ class ExecutionEngine:
         
         注意：只放大数量，不修改原订单对象
         """
-        if not self._high_window_context.is_active:
+        hwc = self._high_window_context  # 单次读取，保证快照一致
+        if not hwc.is_active:
             return order
         
-        multiplier = self._high_window_context.multiplier
+        multiplier = hwc.multiplier
         if multiplier <= 1.0:
             return order
         
         # 检查方向是否一致
-        if self._high_window_context.direction:
-            order_direction = "long" if order.side == "BUY" else "short"
-            if order_direction != self._high_window_context.direction:
+        if hwc.direction:
+            order_direction = _SIDE_TO_DIRECTION[order.side]
+            if order_direction != hwc.direction:
                 logger.warning("订单方向与高交易窗口方向不一致，不应用放大系数")
                 return order
         
         # 创建新订单，应用放大系数
         adjusted_quantity = order.quantity * multiplier
         
-        logger.info(
-            f"应用高交易窗口放大系数: {order.quantity} -> {adjusted_quantity} ({multiplier}x)",
-            extra={"original": order.quantity, "adjusted": adjusted_quantity},
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "应用高交易窗口放大系数: %s -> %s (%sx)",
+                order.quantity,
+                adjusted_quantity,
+                multiplier,
+                extra={"original": order.quantity, "adjusted": adjusted_quantity},
+            )
         
-        return Order(
-            order_id=order.order_id,
-            symbol=order.symbol,
-            side=order.side,
-            order_type=order.order_type,
-            quantity=adjusted_quantity,
-            price=order.price,
-            strategy_id=order.strategy_id,
-            validity_window=order.validity_window,
-        )
+        return order.model_copy(update={"quantity": adjusted_quantity})
     
     async def execute_order(self, order: Order) -> ExecutionResult:
         """
@@ -164,59 +197,67 @@ class ExecutionEngine:
         Returns:
             执行结果
         """
-        async with self._lock:
+        # 热路径：预先绑定常用属性，避免重复的属性链查找
+        order_id = order.order_id
+        exec_logger = self.logger
+        order_manager = self.order_manager
+        
+        async with self._lock_for(order.symbol):
             # 1. 幂等性检查
-            if order.order_id in self._executed_orders:
-                logger.warning(f"订单已执行: {order.order_id}")
-                raise OrderRejectedError(f"订单已执行: {order.order_id}")
+            if order_id in self._executed_orders:
+                logger.warning("订单已执行: %s", order_id)
+                raise OrderRejectedError(f"订单已执行: {order_id}")
             
             # 2. 冻结检查
             if self._frozen:
-                self.logger.log_order_rejected(order.order_id, f"执行层已冻结: {self._freeze_reason}")
+                exec_logger.log_order_rejected(order_id, f"执行层已冻结: {self._freeze_reason}")
                 raise ExecutionError(f"执行层已冻结: {self._freeze_reason}")
             
             # 3. 状态机检查（不能绕过状态机）
-            if not self.state_service.is_trading_allowed():
-                self.logger.log_order_rejected(
-                    order.order_id,
-                    f"状态机不允许交易: {self.state_service.get_current_state().value}"
+            current_state = self.state_service.get_current_state()
+            if current_state not in self._allowed_states:
+                exec_logger.log_order_rejected(
+                    order_id,
+                    f"状态机不允许交易: {current_state.value}"
                 )
                 raise ArchitectureViolationError(
                     "不能绕过状态机执行交易",
-                    {"state": self.state_service.get_current_state().value},
+                    {"state": current_state.value},
                 )
             
             # 4. 应用高交易窗口仓位放大系数
-            adjusted_order = self._apply_high_window_multiplier(order)
+            adjusted_order = (
+                self._apply_high_window_multiplier(order)
+                if self._hw_active_and_scaling
+                else order
+            )
             
             # 5. 仓位限制检查（使用调整后的订单）
             passed, reason = await self.position_manager.check_position_limit(adjusted_order)
             if not passed:
-                self.logger.log_order_rejected(order.order_id, reason)
+                exec_logger.log_order_rejected(order_id, reason)
                 raise OrderRejectedError(reason)
             
             # 6. 提交订单
-            await self.order_manager.submit_order(adjusted_order)
-            self.logger.log_order_submitted(adjusted_order)
+            await order_manager.submit_order(adjusted_order)
+            exec_logger.log_order_submitted(adjusted_order)
             
             try:
                 # 7. 执行订单
                 exchange_result = await self.exchange.place_order(adjusted_order)
                 
                 # 8. 计算滑点
-                slippage = self._calculate_slippage(adjusted_order, exchange_result.executed_price)
+                slippage = self._calculate_slippage(adjusted_order.price, exchange_result.executed_price)
                 
                 # 9. 滑点检查
                 if slippage > ExecutionConstants.slippage.max_allowed:
-                    logger.warning(f"滑点过大: {slippage:.4%}")
+                    logger.warning("滑点过大: %.4f%%", slippage * 100)
                 
                 # 10. 构建执行结果
-                flags = []
-                if self._high_window_context.is_active:
-                    flags.append("HIGH_WINDOW_APPLIED")
+                flags = self._HW_FLAGS if self._high_window_context.is_active else self._EMPTY_FLAGS
                 
                 result = ExecutionResult(
-                    order_id=order.order_id,
+                    order_id=order_id,
                     status=exchange_result.status,
                     executed_quantity=exchange_result.executed_quantity,
                     executed_price=exchange_result.executed_price,
@@ -227,15 +268,15 @@ class ExecutionEngine:
                 
                 # 11. 记录日志
                 if exchange_result.status == OrderStatus.FILLED:
-                    self.logger.log_order_filled(order.order_id, result)
-                    await self.order_manager.mark_completed(order.order_id, OrderStatus.FILLED)
-                    self._executed_orders.add(order.order_id)
+                    exec_logger.log_order_filled(order_id, result)
+                    await order_manager.mark_completed(order_id, OrderStatus.FILLED)
+                    self._executed_orders.add(order_id)
                 
                 return result
                 
             except Exception as e:
-                self.logger.log_execution_error(order.order_id, str(e))
-                await self.order_manager.mark_completed(order.order_id, OrderStatus.REJECTED)
+                exec_logger.log_execution_error(order_id, str(e))
+                await order_manager.mark_completed(order_id, OrderStatus.REJECTED)
                 raise ExecutionError(f"订单执行失败: {e}")
     
     async def cancel_order(self, order_id: str, reason: str) -> bool:
@@ -262,7 +303,7 @@ class ExecutionEngine:
             撤销数量
         """
         count = await self.order_manager.cancel_all_pending(reason)
-        logger.info(f"批量撤销 {count} 个订单")
+        logger.info("批量撤销 %d 个订单", count)
         return count
     
     async def freeze(self, reason: str) -> None:
@@ -278,7 +319,7 @@ class ExecutionEngine:
         # 撤销所有待处理订单
         await self.cancel_all_orders(f"执行层冻结: {reason}")
         
-        logger.warning(f"执行层已冻结: {reason}")
+        logger.warning("执行层已冻结: %s", reason)
     
     async def unfreeze(self) -> None:
         """解冻执行"""
@@ -290,9 +331,7 @@ class ExecutionEngine:
         """同步仓位"""
         await self.position_manager.sync_position(symbol)
     
-    def _calculate_slippage(self, order: Order, executed_price: float) -> float:
-        """计算滑点"""
-        if order.price is None or order.price == 0:
-            return 0.0
-        
-        return abs(executed_price - order.price) / order.price
+    @staticmethod
+    def _calculate_slippage(ref_price: float | None, executed_price: float) -> float:
+        """计算滑点（ref_price 为 None 或 0 时视为市价单，滑点为 0）"""
+        return 0.0 if not ref_price else abs(executed_price - ref_price) / ref_price
@@ -2,7 +2,7 @@
 
 from .base import ExchangeClient, ExchangeOrderResult, Position
 from .binance import BinanceClient
-from .manager import ExchangeManager
+from .manager import CircuitState, ExchangeManager
 
 __all__ = [
     "ExchangeClient",
@@ -10,4 +10,5 @@ __all__ = [
     "Position",
     "BinanceClient",
     "ExchangeManager",
+    "CircuitState",
 ]
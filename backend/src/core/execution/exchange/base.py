@@ -5,8 +5,10 @@ BTC 自动交易系统 — 交易所基类
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from datetime import datetime
+from types import MappingProxyType
 from typing import Any
 
 from src.common.enums import OrderSide, OrderStatus, OrderType
@@ -14,7 +16,11 @@ from src.common.models import Order
 from src.common.utils import utc_now
 
 
-@dataclass
+# 共享的只读空响应，避免每个结果分配空 dict
+_EMPTY_RAW_RESPONSE: Mapping[str, Any] = MappingProxyType({})
+
+
+@dataclass(slots=True, frozen=True)
 class Position:
     """仓位信息"""
     symbol: str
@@ -27,7 +33,7 @@ class Position:
     timestamp: datetime = field(default_factory=utc_now)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExchangeOrderResult:
     """交易所订单结果"""
     order_id: str
@@ -37,7 +43,7 @@ class ExchangeOrderResult:
     executed_price: float
     commission: float = 0.0
     timestamp: datetime = field(default_factory=utc_now)
-    raw_response: dict[str, Any] = field(default_factory=dict)
+    raw_response: Mapping[str, Any] = field(default_factory=lambda: _EMPTY_RAW_RESPONSE)
 
 
 class ExchangeClient(ABC):
@@ -96,6 +102,37 @@ class ExchangeClient(ABC):
         """
         pass
     
+    async def cancel_orders_batch(self, order_ids: list[str], symbol: str) -> list[bool]:
+        """
+        批量撤单
+        
+        默认逐笔调用 cancel_order；支持批量接口的交易所应覆盖此方法，
+        以一次请求完成撤单。
+        
+        Args:
+            order_ids: 订单 ID 列表
+            symbol: 交易对
+        
+        Returns:
+            与 order_ids 一一对应的撤单结果
+        """
+        return [await self.cancel_order(order_id, symbol) for order_id in order_ids]
+    
+    async def get_orders_status(self, order_ids: list[str], symbol: str) -> list[OrderStatus]:
+        """
+        批量获取订单状态
+        
+        默认逐笔调用 get_order_status；交易所可覆盖为更少的请求。
+        
+        Args:
+            order_ids: 订单 ID 列表
+            symbol: 交易对
+        
+        Returns:
+            与 order_ids 一一对应的订单状态
+        """
+        return [await self.get_order_status(order_id, symbol) for order_id in order_ids]
+    
     @abstractmethod
     async def get_order_status(self, order_id: str, symbol: str) -> OrderStatus:
         """
@@ -5,14 +5,19 @@ Binance Futures API 集成，包含 REST 和 WebSocket。
 """
 
 import asyncio
-import hashlib
+import copy
 import hmac
+import importlib.util
 import inspect
 import json
+import logging
+import re
+import ssl
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Callable
+from typing import Any, Awaitable, Callable, ClassVar
 from urllib.parse import urlencode
 
 from src.common.enums import OrderSide, OrderStatus, OrderType
@@ -25,8 +30,43 @@ from .base import ExchangeClient, ExchangeOrderResult, Position
 
 logger = get_logger(__name__)
 
+# 查询参数值中无需转义的字符（与 quote_plus 的保留字符一致）
+_UNSAFE_QUERY_CHARS = re.compile(r"[^A-Za-z0-9_.\-~]")
 
-@dataclass
+# 支持的 REST 方法
+_HTTP_METHODS = frozenset({"GET", "POST", "DELETE", "PUT"})
+
+# 可选依赖 orjson：C 实现的 JSON 解析，未安装时退回标准库
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# 响应压缩：httpx 自动解压；br 需要可选依赖 brotli/brotlicffi，否则只声明 gzip
+_ACCEPT_ENCODING = (
+    "gzip, br"
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi")
+    else "gzip"
+)
+
+
+# 下单参数的预计算编码（Binance 下单接口使用 URL 编码参数而非 JSON）
+_SIDE_PARAM: dict[OrderSide, str] = {side: side.value.upper() for side in OrderSide}
+_TYPE_PARAM: dict[OrderType, str] = {order_type: order_type.value.upper() for order_type in OrderType}
+
+# Binance 订单状态 -> 内部订单状态
+_STATUS_MAP: dict[str, OrderStatus] = {
+    "NEW": OrderStatus.SUBMITTED,
+    "PARTIALLY_FILLED": OrderStatus.PARTIALLY_FILLED,
+    "FILLED": OrderStatus.FILLED,
+    "CANCELED": OrderStatus.CANCELLED,
+    "REJECTED": OrderStatus.REJECTED,
+    "EXPIRED": OrderStatus.CANCELLED,
+}
+
+
+@dataclass(slots=True)
 class AccountInfo:
     """账户信息"""
     total_balance: float = 0.0
@@ -36,14 +76,51 @@ class AccountInfo:
     timestamp: datetime = field(default_factory=utc_now)
 
 
-@dataclass
+@dataclass(slots=True)
 class TickerPrice:
-    """实时价格"""
+    """实时价格（每个交易对一个实例，原地更新）"""
     symbol: str
     price: float
     timestamp: datetime = field(default_factory=utc_now)
 
 
+_MISSING = object()
+
+
+class _TTLCache:
+    """带过期时间的 LRU 缓存（单事件循环内使用，无需加锁）"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+    
+    def get(self, key: Any, default: Any = _MISSING) -> Any:
+        """读取未过期的值，命中时刷新 LRU 顺序"""
+        item = self._data.get(key)
+        if item is not None:
+            expires_at, value = item
+            if time.monotonic() < expires_at:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._data[key]
+        self.misses += 1
+        return default
+    
+    def set(self, key: Any, value: Any) -> None:
+        """写入值，超出容量时淘汰最久未使用的条目"""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def clear(self) -> None:
+        self._data.clear()
+
+
 class BinanceClient(ExchangeClient):
     """
     Binance Futures 客户端
@@ -56,28 +133,88 @@ class BinanceClient(ExchangeClient):
     BASE_URL = "https://fapi.binance.com"
     WS_URL = "wss://fstream.binance.com/ws"
     
+    # 进程内共享的 httpx 客户端（见 configure_shared）
+    _shared_client: ClassVar[Any] = None
+    
+    # 批量撤单接口单次最大订单数
+    BATCH_CANCEL_LIMIT = 10
+    # WebSocket 重连退避上限（秒）与心跳
+    WS_RECONNECT_MAX_DELAY = 32
+    WS_PING_INTERVAL = 20
+    WS_PING_TIMEOUT = 10
+    # positionRisk 快照有效期（秒）
+    POSITIONS_SNAPSHOT_TTL = 0.5
+    # listenKey 保活间隔（秒），Binance 60 分钟未保活即失效
+    LISTEN_KEY_KEEPALIVE_SECONDS = 1800
+    
     def __init__(
         self,
         api_key: str = "",
         api_secret: str = "",
         testnet: bool = False,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 5,
+        keepalive_expiry: float = 30.0,
     ):
         self.api_key = api_key
         self.api_secret = api_secret
         self.testnet = testnet
+        
+        # 签名模板：密钥在客户端生命周期内不变，预先完成 HMAC 密钥初始化。
+        # digestmod 传名称时 CPython 直接走 OpenSSL HMAC（EVP），可用 SHA-NI 等硬件加速
+        self._hmac_template = hmac.new(api_secret.encode(), digestmod="sha256")
+        self._headers = self._get_headers()
         self._client: Any = None
+        self._owns_client = True
         self._connected = False
         
+        # REST 连接池
+        self._max_connections = max_connections
+        self._max_keepalive_connections = max_keepalive_connections
+        self._keepalive_expiry = keepalive_expiry
+        
         # WebSocket
         self._ws: Any = None
-        self._ws_connected = False
+        self._ws_connected = False  # 当前连接是否可用，断线重连期间为 False
+        self._ws_running = False  # 消息循环是否继续运行（含断线重连期间）
         self._ws_task: asyncio.Task | None = None
-        self._ws_callbacks: dict[str, list[Callable]] = {}
-        self._ws_reconnect_delay = 5
+        # 回调按事件类型登记，注册时按同步/协程分开存放
+        self._ws_sync_callbacks: dict[str, list[Callable[[dict], Any]]] = {}
+        self._ws_async_callbacks: dict[str, list[Callable[[dict], Awaitable[Any]]]] = {}
+        self._ws_event_handlers: dict[str, Callable[[dict], Awaitable[None]]] = {
+            "kline": self._handle_kline,
+            "depthUpdate": self._handle_depth,
+            "trade": self._handle_trade,
+            "aggTrade": self._handle_trade,
+            "markPriceUpdate": self._handle_mark_price,
+            "ACCOUNT_UPDATE": self._handle_account_update,
+            "ORDER_TRADE_UPDATE": self._handle_order_update,
+        }
+        self._ws_streams: list[str] = []
+        self._ws_reconnect_delay = 2  # 首次重连延迟，之后指数退避
+        
+        # 用户数据流
+        self._listen_key: str | None = None
+        self._listen_key_task: asyncio.Task | None = None
+        
+        # 进行中的 GET 请求：(endpoint, signed, params, dedupe_tag) -> Task
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        
+        # 完整 URL 缓存：endpoint -> BASE_URL + endpoint
+        self._url_cache: dict[str, str] = {}
         
         # 缓存
         self._ticker_cache: dict[str, TickerPrice] = {}
         self._position_cache: dict[str, Position] = {}
+        # positionRisk 快照：(获取时刻 monotonic, symbol -> 原始条目)
+        self._positions_snapshot: tuple[float, dict[str, dict]] = (float("-inf"), {})
+        # 快照代数：每次失效递增，早于失效发起的查询结果不写入快照
+        self._positions_generation = 0
+        
+        # 幂等 GET 接口的 TTL 缓存
+        self._price_ttl_cache = _TTLCache(maxsize=512, ttl=1.0)
+        self._funding_ttl_cache = _TTLCache(maxsize=256, ttl=30.0)
+        self._exchange_info_ttl_cache = _TTLCache(maxsize=1, ttl=300.0)
         
         if testnet:
             self.BASE_URL = "https://testnet.binancefuture.com"
@@ -95,25 +232,102 @@ class BinanceClient(ExchangeClient):
     def is_ws_connected(self) -> bool:
         return self._ws_connected
     
+    @property
+    def cache_hit_ratio(self) -> float:
+        """TTL 缓存命中率"""
+        caches = (self._price_ttl_cache, self._funding_ttl_cache, self._exchange_info_ttl_cache)
+        hits = sum(c.hits for c in caches)
+        total = hits + sum(c.misses for c in caches)
+        return hits / total if total else 0.0
+    
     # ========================================
     # 连接管理
     # ========================================
     
+    @staticmethod
+    def _build_http_client(
+        max_connections: int,
+        max_keepalive_connections: int,
+        keepalive_expiry: float,
+    ) -> Any:
+        """创建 httpx 连接池（不带鉴权头，API Key 按请求发送）"""
+        import httpx
+        
+        # HTTP/2 需要可选依赖 h2（httpx[http2]），未安装时退回 HTTP/1.1 keep-alive
+        return httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            timeout=httpx.Timeout(connect=5.0, read=30.0, write=10.0, pool=5.0),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+    
+    @classmethod
+    def configure_shared(
+        cls,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+    ) -> Any:
+        """
+        创建进程内共享的 httpx 连接池
+        
+        多个 BinanceClient（主备、测试网）共用一个连接池和 TLS 上下文。
+        已存在时直接返回。
+        """
+        if BinanceClient._shared_client is None:
+            cls.set_shared_client(
+                cls._build_http_client(max_connections, max_keepalive_connections, keepalive_expiry)
+            )
+        return BinanceClient._shared_client
+    
+    @classmethod
+    def get_shared_client(cls) -> Any:
+        """获取共享 httpx 客户端，未设置时为 None"""
+        return BinanceClient._shared_client
+    
+    @classmethod
+    def set_shared_client(cls, client: Any) -> None:
+        """设置共享 httpx 客户端，之后 connect 的实例将复用它"""
+        BinanceClient._shared_client = client
+    
+    @classmethod
+    async def close_shared(cls) -> None:
+        """关闭共享 httpx 客户端"""
+        client = BinanceClient._shared_client
+        BinanceClient._shared_client = None
+        if client is not None:
+            await client.aclose()
+    
     async def connect(self) -> None:
         """建立 REST 连接"""
-        import httpx
-        self._client = httpx.AsyncClient(timeout=30.0)
+        shared = BinanceClient._shared_client
+        self._owns_client = shared is None
+        self._client = shared or self._build_http_client(
+            self._max_connections,
+            self._max_keepalive_connections,
+            self._keepalive_expiry,
+        )
         self._connected = True
-        logger.info(f"Binance REST 客户端已连接 (testnet={self.testnet})")
+        logger.info(
+            f"Binance REST 客户端已连接 (testnet={self.testnet}, shared={not self._owns_client}, "
+            f"http2={importlib.util.find_spec('h2') is not None}, openssl={ssl.OPENSSL_VERSION})"
+        )
     
     async def disconnect(self) -> None:
         """断开所有连接"""
         # 关闭 WebSocket
         await self.ws_disconnect()
         
-        # 关闭 REST
+        # 关闭用户数据流
+        await self._stop_user_stream()
+        
+        # 关闭 REST（共享连接池由 close_shared 负责关闭）
         if self._client:
-            await self._client.aclose()
+            if self._owns_client:
+                await self._client.aclose()
             self._client = None
         self._connected = False
         logger.info("Binance 客户端已断开")
@@ -122,19 +336,30 @@ class BinanceClient(ExchangeClient):
     # REST API - 签名和请求
     # ========================================
     
-    def _sign(self, params: dict[str, Any]) -> str:
+    def _encode_query(self, params: dict[str, Any]) -> str:
+        """
+        编码查询字符串
+        
+        Binance 参数（交易对、数量、时间戳等）通常只含安全字符，直接拼接即可；
+        任一值需要转义时退回 urlencode，结果与 urlencode 一致。
+        """
+        parts = []
+        for key, value in params.items():
+            value = str(value)
+            if _UNSAFE_QUERY_CHARS.search(value):
+                return urlencode(params)
+            parts.append(f"{key}={value}")
+        return "&".join(parts)
+    
+    def _sign(self, query_string: str) -> str:
         """生成 HMAC SHA256 签名"""
-        query_string = urlencode(params)
-        signature = hmac.new(
-            self.api_secret.encode(),
-            query_string.encode(),
-            hashlib.sha256,
-        ).hexdigest()
-        return signature
+        h = self._hmac_template.copy()
+        h.update(query_string.encode())
+        return h.hexdigest()
     
     def _get_headers(self) -> dict[str, str]:
         """获取请求头"""
-        return {"X-MBX-APIKEY": self.api_key}
+        return {"X-MBX-APIKEY": self.api_key, "Accept-Encoding": _ACCEPT_ENCODING}
     
     @retry_with_backoff(max_retries=3, base_delay=0.5)
     async def _request(
@@ -143,33 +368,58 @@ class BinanceClient(ExchangeClient):
         endpoint: str,
         params: dict[str, Any] | None = None,
         signed: bool = False,
+        dedupe_tag: int = 0,
     ) -> dict[str, Any] | list[Any]:
-        """发送 REST 请求"""
+        """
+        发送 REST 请求
+        
+        并发的相同 GET 请求共享同一次调用，结果为共享对象，调用方不应修改。
+        dedupe_tag 不同的 GET 不合并，用于避免复用缓存失效前发起的请求。
+        """
         if not self._client:
             raise RuntimeError("客户端未连接")
+        if method not in _HTTP_METHODS:
+            raise ValueError(f"不支持的方法: {method}")
+        
+        if method != "GET":
+            return await self._send(method, endpoint, params, signed)
         
+        # 去重键在签名前计算，不含 timestamp
+        key = (endpoint, signed, tuple(sorted(params.items())) if params else (), dedupe_tag)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._send(method, endpoint, params, signed))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._inflight.pop(key, None))
+        # shield：单个调用方被取消不影响其他等待者
+        return await asyncio.shield(task)
+    
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        params: dict[str, Any] | None,
+        signed: bool,
+    ) -> dict[str, Any] | list[Any]:
+        """签名并发送请求"""
         params = params or {}
+        url = self._url_cache.get(endpoint)
+        if url is None:
+            url = self._url_cache[endpoint] = f"{self.BASE_URL}{endpoint}"
         
         if signed:
-            params["timestamp"] = int(time.time() * 1000)
-            params["signature"] = self._sign(params)
-        
-        url = f"{self.BASE_URL}{endpoint}"
-        headers = self._get_headers()
-        
-        if method == "GET":
-            response = await self._client.get(url, params=params, headers=headers)
-        elif method == "POST":
-            response = await self._client.post(url, params=params, headers=headers)
-        elif method == "DELETE":
-            response = await self._client.delete(url, params=params, headers=headers)
-        elif method == "PUT":
-            response = await self._client.put(url, params=params, headers=headers)
-        else:
-            raise ValueError(f"不支持的方法: {method}")
+            # 签名与发送使用同一查询字符串，避免 httpx 重新编码后与签名不一致
+            params["timestamp"] = time.time_ns() // 1_000_000
+            query_string = self._encode_query(params)
+            url = f"{url}?{query_string}&signature={self._sign(query_string)}"
+            params = None
+        
+        # 连接池可能被多个账户共享，API Key 请求头按请求发送
+        response = await self._client.request(method, url, params=params, headers=self._headers)
         
         response.raise_for_status()
-        return response.json()
+        # 直接从字节解析，跳过 response.json() 先解码为 str 的中间拷贝
+        return _json_loads(response.content)
     
     # ========================================
     # REST API - 订单操作
@@ -179,8 +429,8 @@ class BinanceClient(ExchangeClient):
         """下单"""
         params: dict[str, Any] = {
             "symbol": order.symbol,
-            "side": order.side.value.upper(),
-            "type": order.order_type.value.upper(),
+            "side": _SIDE_PARAM[order.side],
+            "type": _TYPE_PARAM[order.order_type],
             "quantity": str(order.quantity),
             "newClientOrderId": order.order_id,
         }
@@ -190,14 +440,16 @@ class BinanceClient(ExchangeClient):
             params["price"] = str(order.price)
             params["timeInForce"] = "GTC"
         
-        # 止损/止盈单
-        if order.stop_price:
-            params["stopPrice"] = str(order.stop_price)
+        # 止损/止盈单（Order 模型暂无 stop_price 字段）
+        stop_price = getattr(order, "stop_price", None)
+        if stop_price:
+            params["stopPrice"] = str(stop_price)
         
         try:
             result = await self._request("POST", "/fapi/v1/order", params, signed=True)
+            self._invalidate_positions_snapshot()
             
-            status = self._parse_status(result.get("status", ""))
+            status = self._parse_status(result.get("status"))
             
             return ExchangeOrderResult(
                 order_id=order.order_id,
@@ -232,6 +484,29 @@ class BinanceClient(ExchangeClient):
             logger.error(f"撤单失败: {order_id}, {e}")
             return False
     
+    async def cancel_orders_batch(self, order_ids: list[str], symbol: str) -> list[bool]:
+        """批量撤单（每次请求最多 BATCH_CANCEL_LIMIT 个）"""
+        results: list[bool] = []
+        for start in range(0, len(order_ids), self.BATCH_CANCEL_LIMIT):
+            chunk = order_ids[start:start + self.BATCH_CANCEL_LIMIT]
+            try:
+                params = {
+                    "symbol": symbol,
+                    "origClientOrderIdList": json.dumps(chunk, separators=(",", ":")),
+                }
+                result = await self._request("DELETE", "/fapi/v1/batchOrders", params, signed=True)
+                # 成功项为订单对象，失败项为 {"code": ..., "msg": ...}
+                chunk_results = [
+                    isinstance(item, dict) and "code" not in item
+                    for item in result
+                ]
+                results.extend(chunk_results)
+                logger.info(f"批量撤单: {symbol}, 成功 {sum(chunk_results)}/{len(chunk)}")
+            except Exception as e:
+                logger.error(f"批量撤单失败: {symbol}, {e}")
+                results.extend([False] * len(chunk))
+        return results
+    
     async def cancel_all_orders(self, symbol: str) -> bool:
         """撤销所有订单"""
         try:
@@ -251,11 +526,29 @@ class BinanceClient(ExchangeClient):
                 "origClientOrderId": order_id,
             }
             result = await self._request("GET", "/fapi/v1/order", params, signed=True)
-            return self._parse_status(result.get("status", ""))
+            return self._parse_status(result.get("status"))
         except Exception as e:
             logger.error(f"获取订单状态失败: {order_id}, {e}")
             return OrderStatus.PENDING
     
+    async def get_orders_status(self, order_ids: list[str], symbol: str) -> list[OrderStatus]:
+        """
+        批量获取订单状态
+        
+        一次 openOrders 请求覆盖仍挂单的订单；不在其中的（已成交/已撤销）再逐笔并发查询。
+        """
+        open_status = {
+            o.get("clientOrderId"): self._parse_status(o.get("status"))
+            for o in await self.get_open_orders(symbol)
+        }
+        missing = [order_id for order_id in order_ids if order_id not in open_status]
+        if missing:
+            statuses = await asyncio.gather(
+                *(self.get_order_status(order_id, symbol) for order_id in missing)
+            )
+            open_status.update(zip(missing, statuses))
+        return [open_status[order_id] for order_id in order_ids]
+    
     async def get_open_orders(self, symbol: str | None = None) -> list[dict]:
         """获取未成交订单"""
         try:
@@ -298,27 +591,44 @@ class BinanceClient(ExchangeClient):
     # REST API - 账户和仓位
     # ========================================
     
+    async def _get_positions_index(self) -> dict[str, dict]:
+        """
+        获取按交易对索引的 positionRisk 快照
+        
+        positionRisk 一次返回全部交易对（多资产模式下数百条），
+        短时间内的多次查询复用同一快照，避免重复请求和线性扫描。
+        """
+        fetched_at, index = self._positions_snapshot
+        now = time.monotonic()
+        if now - fetched_at < self.POSITIONS_SNAPSHOT_TTL:
+            return index
+        
+        # 以代数作为去重标记，失效后的查询不会合并到失效前发起的请求上
+        generation = self._positions_generation
+        result = await self._request(
+            "GET", "/fapi/v2/positionRisk", signed=True, dedupe_tag=generation
+        )
+        index = {pos.get("symbol", ""): pos for pos in result}
+        # 请求期间快照已失效时，结果可能是变化前的仓位，不写入快照
+        if generation == self._positions_generation:
+            self._positions_snapshot = (now, index)
+        return index
+    
+    def _invalidate_positions_snapshot(self) -> None:
+        """仓位可能变化（下单、账户推送）时使快照失效"""
+        self._positions_generation += 1
+        self._positions_snapshot = (float("-inf"), {})
+    
     async def get_position(self, symbol: str) -> Position:
         """获取仓位"""
         try:
-            result = await self._request("GET", "/fapi/v2/positionRisk", signed=True)
+            index = await self._get_positions_index()
             
-            for pos in result:
-                if pos.get("symbol") == symbol:
-                    quantity = float(pos.get("positionAmt", 0))
-                    side = "LONG" if quantity > 0 else "SHORT" if quantity < 0 else "NONE"
-                    
-                    position = Position(
-                        symbol=symbol,
-                        side=side,
-                        quantity=abs(quantity),
-                        entry_price=float(pos.get("entryPrice", 0)),
-                        unrealized_pnl=float(pos.get("unRealizedProfit", 0)),
-                        leverage=int(pos.get("leverage", 1)),
-                        margin=float(pos.get("isolatedMargin", 0) or pos.get("positionInitialMargin", 0)),
-                    )
-                    self._position_cache[symbol] = position
-                    return position
+            pos = index.get(symbol)
+            if pos is not None:
+                position = self._parse_position(pos)
+                self._position_cache[symbol] = position
+                return position
             
             return Position(symbol=symbol, side="NONE", quantity=0, entry_price=0)
         except Exception as e:
@@ -329,6 +639,36 @@ class BinanceClient(ExchangeClient):
                 Position(symbol=symbol, side="NONE", quantity=0, entry_price=0)
             )
     
+    async def get_positions_batch(self, symbols: list[str]) -> dict[str, Position]:
+        """
+        批量获取仓位
+        
+        positionRisk 一次返回全部交易对，只需一次请求。
+        """
+        wanted = set(symbols)
+        try:
+            index = await self._get_positions_index()
+            
+            positions: dict[str, Position] = {}
+            for symbol in wanted:
+                pos = index.get(symbol)
+                if pos is None:
+                    positions[symbol] = Position(symbol=symbol, side="NONE", quantity=0, entry_price=0)
+                    continue
+                position = self._parse_position(pos)
+                positions[symbol] = position
+                self._position_cache[symbol] = position
+            return positions
+        except Exception as e:
+            logger.error(f"批量获取仓位失败: {e}")
+            return {
+                symbol: self._position_cache.get(
+                    symbol,
+                    Position(symbol=symbol, side="NONE", quantity=0, entry_price=0),
+                )
+                for symbol in wanted
+            }
+    
     async def get_all_positions(self) -> list[Position]:
         """获取所有仓位"""
         try:
@@ -336,24 +676,12 @@ class BinanceClient(ExchangeClient):
             positions = []
             
             for pos in result:
-                quantity = float(pos.get("positionAmt", 0))
-                if quantity == 0:
+                if float(pos.get("positionAmt", 0)) == 0:
                     continue
                 
-                side = "LONG" if quantity > 0 else "SHORT"
-                symbol = pos.get("symbol", "")
-                
-                position = Position(
-                    symbol=symbol,
-                    side=side,
-                    quantity=abs(quantity),
-                    entry_price=float(pos.get("entryPrice", 0)),
-                    unrealized_pnl=float(pos.get("unRealizedProfit", 0)),
-                    leverage=int(pos.get("leverage", 1)),
-                    margin=float(pos.get("isolatedMargin", 0) or pos.get("positionInitialMargin", 0)),
-                )
+                position = self._parse_position(pos)
                 positions.append(position)
-                self._position_cache[symbol] = position
+                self._position_cache[position.symbol] = position
             
             return positions
         except Exception as e:
@@ -430,17 +758,48 @@ class BinanceClient(ExchangeClient):
     
     async def get_ticker_price(self, symbol: str) -> float:
         """获取最新价格"""
+        price = self._price_ttl_cache.get(symbol)
+        if price is not _MISSING:
+            return price
+        
         try:
             params = {"symbol": symbol}
             result = await self._request("GET", "/fapi/v1/ticker/price", params)
             price = float(result.get("price", 0))
-            self._ticker_cache[symbol] = TickerPrice(symbol=symbol, price=price)
+            self._update_ticker(symbol, price)
+            self._price_ttl_cache.set(symbol, price)
             return price
         except Exception as e:
             logger.error(f"获取价格失败: {symbol}, {e}")
             cached = self._ticker_cache.get(symbol)
             return cached.price if cached else 0.0
     
+    async def get_ticker_prices_batch(self, symbols: list[str]) -> dict[str, float]:
+        """
+        批量获取最新价格
+        
+        不带 symbol 请求 ticker/price 一次返回全部交易对，只需一次请求。
+        """
+        wanted = set(symbols)
+        try:
+            result = await self._request("GET", "/fapi/v1/ticker/price")
+            
+            prices: dict[str, float] = {}
+            for item in result:
+                symbol = item.get("symbol", "")
+                if symbol in wanted:
+                    price = float(item.get("price", 0))
+                    prices[symbol] = price
+                    self._update_ticker(symbol, price)
+            return prices
+        except Exception as e:
+            logger.error(f"批量获取价格失败: {e}")
+            return {
+                symbol: self._ticker_cache[symbol].price
+                for symbol in wanted
+                if symbol in self._ticker_cache
+            }
+    
     async def get_klines(
         self,
         symbol: str,
@@ -463,9 +822,10 @@ class BinanceClient(ExchangeClient):
             
             result = await self._request("GET", "/fapi/v1/klines", params)
             
-            bars = []
-            for row in result:
-                bars.append(MarketBar(
+            # 字段已显式转换为目标类型，使用 model_construct 跳过逐行 Pydantic 校验
+            construct = MarketBar.model_construct
+            return [
+                construct(
                     ts=int(row[0]),
                     symbol=symbol,
                     interval=interval,
@@ -476,32 +836,46 @@ class BinanceClient(ExchangeClient):
                     volume=float(row[5]),
                     quote_volume=float(row[7]),
                     trades=int(row[8]),
-                ))
-            return bars
+                )
+                for row in result
+            ]
         except Exception as e:
             logger.error(f"获取 K 线失败: {symbol}, {e}")
             return []
     
     async def get_funding_rate(self, symbol: str) -> float:
         """获取当前资金费率"""
+        rate = self._funding_ttl_cache.get(symbol)
+        if rate is not _MISSING:
+            return rate
+        
         try:
             params = {"symbol": symbol}
             result = await self._request("GET", "/fapi/v1/premiumIndex", params)
-            return float(result.get("lastFundingRate", 0))
+            rate = float(result.get("lastFundingRate", 0))
+            self._funding_ttl_cache.set(symbol, rate)
+            return rate
         except Exception as e:
             logger.error(f"获取资金费率失败: {symbol}, {e}")
             return 0.0
     
     async def get_exchange_info(self, symbol: str | None = None) -> dict:
-        """获取交易规则"""
+        """
+        获取交易规则
+        
+        缓存的结果被所有调用方共享，返回深拷贝，调用方修改返回值不会影响缓存。
+        """
         try:
-            result = await self._request("GET", "/fapi/v1/exchangeInfo")
+            result = self._exchange_info_ttl_cache.get("exchangeInfo")
+            if result is _MISSING:
+                result = await self._request("GET", "/fapi/v1/exchangeInfo")
+                self._exchange_info_ttl_cache.set("exchangeInfo", result)
             if symbol:
                 for s in result.get("symbols", []):
                     if s.get("symbol") == symbol:
-                        return s
+                        return copy.deepcopy(s)
                 return {}
-            return result
+            return copy.deepcopy(result)
         except Exception as e:
             logger.error(f"获取交易规则失败: {e}")
             return {}
@@ -517,14 +891,12 @@ class BinanceClient(ExchangeClient):
         Args:
             streams: 订阅的流，如 ["btcusdt@kline_1m", "btcusdt@depth"]
         """
-        import websockets
-        
-        stream_path = "/".join(streams)
-        url = f"{self.WS_URL}/{stream_path}"
+        self._ws_streams = list(streams)
         
         try:
-            self._ws = await websockets.connect(url)
+            self._ws = await self._ws_open()
             self._ws_connected = True
+            self._ws_running = True
             logger.info(f"WebSocket 已连接: {streams}")
             
             # 启动消息处理任务
@@ -532,9 +904,26 @@ class BinanceClient(ExchangeClient):
         except Exception as e:
             logger.error(f"WebSocket 连接失败: {e}")
             self._ws_connected = False
+            self._ws_running = False
+    
+    async def _ws_open(self) -> Any:
+        """按已订阅的流建立 WebSocket 连接"""
+        import websockets
+        
+        url = f"{self.WS_URL}/{'/'.join(self._ws_streams)}"
+        # Binance 推送的是紧凑 JSON，permessage-deflate 只增加 CPU 开销；
+        # ping 心跳用于及时发现静默断开的连接
+        return await websockets.connect(
+            url,
+            compression=None,
+            max_size=2**20,
+            ping_interval=self.WS_PING_INTERVAL,
+            ping_timeout=self.WS_PING_TIMEOUT,
+        )
     
     async def ws_disconnect(self) -> None:
         """断开 WebSocket"""
+        self._ws_running = False
         if self._ws_task:
             self._ws_task.cancel()
             try:
@@ -552,82 +941,106 @@ class BinanceClient(ExchangeClient):
     
     async def _ws_message_loop(self) -> None:
         """WebSocket 消息处理循环"""
-        while self._ws_connected and self._ws:
+        attempt = 0
+        while self._ws_running and self._ws:
             try:
-                message = await self._ws.recv()
-                data = json.loads(message)
-                await self._handle_ws_message(data)
+                async for message in self._ws:
+                    try:
+                        await self._handle_ws_message(_json_loads(message))
+                    except Exception as e:
+                        logger.error(f"WebSocket 消息处理错误: {e}")
+                # 迭代正常结束表示对端关闭了连接
+                logger.warning("WebSocket 连接已关闭")
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                logger.error(f"WebSocket 消息处理错误: {e}")
-                if not self._ws_connected:
-                    break
-                # 尝试重连
-                await asyncio.sleep(self._ws_reconnect_delay)
+                logger.error(f"WebSocket 接收错误: {e}")
+            
+            # 连接已断开，重连成功前不再报告为已连接
+            self._ws_connected = False
+            if not self._ws_running:
+                break
+            
+            # 指数退避后重连，重放订阅的流
+            delay = min(self._ws_reconnect_delay * 2 ** attempt, self.WS_RECONNECT_MAX_DELAY)
+            attempt += 1
+            logger.info(f"WebSocket {delay}s 后重连 (第 {attempt} 次)")
+            await asyncio.sleep(delay)
+            
+            try:
+                await self._ws.close()
+            except Exception:
+                pass
+            try:
+                self._ws = await self._ws_open()
+                self._ws_connected = True
+                attempt = 0
+                logger.info(f"WebSocket 已重连: {self._ws_streams}")
+            except Exception as e:
+                logger.error(f"WebSocket 重连失败: {e}")
     
     async def _handle_ws_message(self, data: dict) -> None:
         """处理 WebSocket 消息"""
         event_type = data.get("e", "")
         
-        # K 线数据
-        if event_type == "kline":
-            await self._handle_kline(data)
-        # 深度数据
-        elif event_type == "depthUpdate":
-            await self._handle_depth(data)
-        # 成交数据
-        elif event_type == "trade" or event_type == "aggTrade":
-            await self._handle_trade(data)
-        # 标记价格
-        elif event_type == "markPriceUpdate":
-            await self._handle_mark_price(data)
-        # 账户更新
-        elif event_type == "ACCOUNT_UPDATE":
-            await self._handle_account_update(data)
-        # 订单更新
-        elif event_type == "ORDER_TRADE_UPDATE":
-            await self._handle_order_update(data)
-        
-        # 触发回调
-        callbacks = self._ws_callbacks.get(event_type, [])
-        for callback in callbacks:
-            try:
-                if inspect.iscoroutinefunction(callback):
-                    await callback(data)
-                else:
-                    callback(data)
-            except Exception as e:
-                logger.error(f"回调执行错误: {e}")
+        # 内置处理（K 线、深度、成交、标记价格、账户、订单）
+        handler = self._ws_event_handlers.get(event_type)
+        if handler is not None:
+            await handler(data)
+        
+        # 同步回调排入事件循环，不阻塞当前消息处理
+        sync_callbacks = self._ws_sync_callbacks.get(event_type)
+        if sync_callbacks:
+            loop = asyncio.get_running_loop()
+            for callback in sync_callbacks:
+                loop.call_soon(self._run_sync_callback, callback, data)
+        
+        # 协程回调并发执行，单个订阅者变慢不阻塞其他订阅者
+        async_callbacks = self._ws_async_callbacks.get(event_type)
+        if async_callbacks:
+            results = await asyncio.gather(
+                *(callback(data) for callback in async_callbacks),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"回调执行错误: {result}")
+    
+    @staticmethod
+    def _run_sync_callback(callback: Callable[[dict], Any], data: dict) -> None:
+        """执行同步回调并记录异常"""
+        try:
+            callback(data)
+        except Exception as e:
+            logger.error(f"回调执行错误: {e}")
     
     def on_ws_event(self, event_type: str, callback: Callable) -> None:
         """注册 WebSocket 事件回调"""
-        if event_type not in self._ws_callbacks:
-            self._ws_callbacks[event_type] = []
-        self._ws_callbacks[event_type].append(callback)
+        if inspect.iscoroutinefunction(callback):
+            self._ws_async_callbacks.setdefault(event_type, []).append(callback)
+        else:
+            self._ws_sync_callbacks.setdefault(event_type, []).append(callback)
     
     async def _handle_kline(self, data: dict) -> None:
         """处理 K 线数据"""
         k = data.get("k", {})
         symbol = k.get("s", "")
+        close = float(k.get("c", 0))
         
-        bar = MarketBar(
-            ts=k.get("t", 0),
-            symbol=symbol,
-            interval=k.get("i", ""),
-            open=float(k.get("o", 0)),
-            high=float(k.get("h", 0)),
-            low=float(k.get("l", 0)),
-            close=float(k.get("c", 0)),
-            volume=float(k.get("v", 0)),
-            quote_volume=float(k.get("q", 0)),
-            trades=int(k.get("n", 0)),
-        )
+        # 推送的 K 线只用于刷新价格缓存，无需构造 MarketBar
+        self._update_ticker(symbol, close)
         
-        # 更新价格缓存
-        self._ticker_cache[symbol] = TickerPrice(symbol=symbol, price=bar.close)
-        
-        logger.debug(f"K线: {symbol} {bar.interval} close={bar.close}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("K线: %s %s close=%s", symbol, k.get("i", ""), close)
+    
+    def _update_ticker(self, symbol: str, price: float) -> None:
+        """原地更新价格缓存，预热后每条消息不再分配对象"""
+        ticker = self._ticker_cache.get(symbol)
+        if ticker is None:
+            self._ticker_cache[symbol] = TickerPrice(symbol=symbol, price=price)
+        else:
+            ticker.price = price
+            ticker.timestamp = utc_now()
     
     async def _handle_depth(self, data: dict) -> None:
         """处理深度数据"""
@@ -638,16 +1051,17 @@ class BinanceClient(ExchangeClient):
         """处理成交数据"""
         symbol = data.get("s", "")
         price = float(data.get("p", 0))
-        self._ticker_cache[symbol] = TickerPrice(symbol=symbol, price=price)
+        self._update_ticker(symbol, price)
     
     async def _handle_mark_price(self, data: dict) -> None:
         """处理标记价格"""
         symbol = data.get("s", "")
         price = float(data.get("p", 0))
-        self._ticker_cache[symbol] = TickerPrice(symbol=symbol, price=price)
+        self._update_ticker(symbol, price)
     
     async def _handle_account_update(self, data: dict) -> None:
         """处理账户更新"""
+        self._invalidate_positions_snapshot()
         logger.info(f"账户更新: {data}")
     
     async def _handle_order_update(self, data: dict) -> None:
@@ -672,6 +1086,47 @@ class BinanceClient(ExchangeClient):
             logger.error(f"启动用户数据流失败: {e}")
             return None
     
+    async def ensure_user_stream(self) -> str | None:
+        """
+        获取用户数据流 listenKey
+        
+        已有有效 listenKey 时直接复用；否则新建并启动后台保活任务。
+        """
+        task = self._listen_key_task
+        if self._listen_key and task and not task.done():
+            return self._listen_key
+        
+        listen_key = await self.start_user_data_stream()
+        if listen_key:
+            self._listen_key = listen_key
+            self._listen_key_task = asyncio.create_task(self._listen_key_keepalive_loop())
+        return listen_key
+    
+    async def _listen_key_keepalive_loop(self) -> None:
+        """listenKey 后台保活"""
+        while True:
+            await asyncio.sleep(self.LISTEN_KEY_KEEPALIVE_SECONDS)
+            if not await self.keepalive_user_data_stream():
+                # 保活失败则丢弃，下次 ensure_user_stream 时重新获取
+                logger.warning("listenKey 保活失败，已丢弃")
+                self._listen_key = None
+                return
+    
+    async def _stop_user_stream(self) -> None:
+        """停止保活任务并关闭用户数据流"""
+        if self._listen_key_task:
+            self._listen_key_task.cancel()
+            try:
+                await self._listen_key_task
+            except asyncio.CancelledError:
+                pass
+            self._listen_key_task = None
+        
+        if self._listen_key:
+            self._listen_key = None
+            if self._client:
+                await self.close_user_data_stream()
+    
     async def keepalive_user_data_stream(self) -> bool:
         """保持用户数据流"""
         try:
@@ -694,17 +1149,24 @@ class BinanceClient(ExchangeClient):
     # 辅助方法
     # ========================================
     
-    def _parse_status(self, status: str) -> OrderStatus:
+    def _parse_status(self, status: str | None) -> OrderStatus:
         """解析订单状态"""
-        status_map = {
-            "NEW": OrderStatus.SUBMITTED,
-            "PARTIALLY_FILLED": OrderStatus.PARTIALLY_FILLED,
-            "FILLED": OrderStatus.FILLED,
-            "CANCELED": OrderStatus.CANCELLED,
-            "REJECTED": OrderStatus.REJECTED,
-            "EXPIRED": OrderStatus.CANCELLED,
-        }
-        return status_map.get(status, OrderStatus.PENDING)
+        return _STATUS_MAP.get(status, OrderStatus.PENDING)
+    
+    def _parse_position(self, pos: dict[str, Any]) -> Position:
+        """解析 positionRisk 条目"""
+        quantity = float(pos.get("positionAmt", 0))
+        side = "LONG" if quantity > 0 else "SHORT" if quantity < 0 else "NONE"
+        
+        return Position(
+            symbol=pos.get("symbol", ""),
+            side=side,
+            quantity=abs(quantity),
+            entry_price=float(pos.get("entryPrice", 0)),
+            unrealized_pnl=float(pos.get("unRealizedProfit", 0)),
+            leverage=int(pos.get("leverage", 1)),
+            margin=float(pos.get("isolatedMargin", 0) or pos.get("positionInitialMargin", 0)),
+        )
     
     def get_cached_price(self, symbol: str) -> float:
         """获取缓存的价格"""
@@ -4,19 +4,35 @@ BTC 自动交易系统 — 交易所管理器
 管理主备交易所切换和故障检测。
 """
 
+import asyncio
+import time
+from enum import Enum
+from typing import Any
+
+from src.common.enums import OrderStatus
 from src.common.logging import get_logger
 from src.common.models import Order
 
 from .base import ExchangeClient, ExchangeOrderResult, Position
+from .binance import BinanceClient
 
 logger = get_logger(__name__)
 
 
+class CircuitState(str, Enum):
+    """主交易所熔断状态"""
+    CLOSED = "closed"        # 正常，使用主交易所
+    OPEN = "open"            # 熔断，使用备用交易所
+    HALF_OPEN = "half_open"  # 冷却结束，用一次请求探测主交易所
+
+
 class ExchangeManager:
     """
     交易所管理器
     
     管理主备交易所，支持故障切换。
+    按方法统计主交易所连续失败次数，任一方法达到阈值即熔断切到备用；
+    冷却期后进入半开状态探测主交易所，探测成功自动切回。
     """
     
     def __init__(
@@ -26,14 +42,23 @@ class ExchangeManager:
     ):
         self.primary = primary
         self.backup = backup
-        self._use_backup = False
-        self._failure_count = 0
+        self._state = CircuitState.CLOSED
+        self._open_until = 0.0
+        self._probe_in_flight = False
+        self._failure_by_method: dict[str, int] = {}
         self._max_failures = 3
+        self._recovery_timeout = 30.0  # 熔断冷却时间（秒）
+        self._owns_shared_http = False  # 是否由本管理器创建了 Binance 共享连接池
+    
+    @property
+    def circuit_state(self) -> CircuitState:
+        """熔断状态"""
+        return self._state
     
     @property
     def current_client(self) -> ExchangeClient:
         """当前使用的客户端"""
-        if self._use_backup and self.backup:
+        if self._state is not CircuitState.CLOSED and self.backup:
             return self.backup
         return self.primary
     
@@ -43,79 +68,147 @@ class ExchangeManager:
         return self.current_client.is_connected
     
     async def connect(self) -> None:
-        """连接交易所"""
-        await self.primary.connect()
+        """连接交易所（主备并行建立连接）"""
+        # 主备均为 Binance 时共用一个 HTTP 连接池
+        binance_clients = [c for c in (self.primary, self.backup) if isinstance(c, BinanceClient)]
+        if len(binance_clients) > 1 and BinanceClient.get_shared_client() is None:
+            BinanceClient.configure_shared()
+            self._owns_shared_http = True
+        
+        coros = [self.primary.connect()]
         if self.backup:
-            await self.backup.connect()
+            coros.append(self.backup.connect())
+        await asyncio.gather(*coros)
         logger.info("交易所管理器已连接")
     
     async def disconnect(self) -> None:
-        """断开连接"""
-        await self.primary.disconnect()
+        """断开连接（并行断开，单个失败不影响另一个）"""
+        clients = [self.primary]
         if self.backup:
-            await self.backup.disconnect()
+            clients.append(self.backup)
+        results = await asyncio.gather(
+            *(client.disconnect() for client in clients),
+            return_exceptions=True,
+        )
+        for client, result in zip(clients, results):
+            if isinstance(result, Exception):
+                logger.error(f"断开交易所连接失败: {type(client).__name__}, {result}")
+        if self._owns_shared_http:
+            await BinanceClient.close_shared()
+            self._owns_shared_http = False
         logger.info("交易所管理器已断开")
     
     async def place_order(self, order: Order) -> ExchangeOrderResult:
         """下单"""
-        try:
-            result = await self.current_client.place_order(order)
-            self._on_success()
-            return result
-        except Exception as e:
-            self._on_failure()
-            if self._should_switch():
-                self._switch_to_backup()
-                return await self.current_client.place_order(order)
-            raise
+        return await self._call("place_order", order)
     
     async def cancel_order(self, order_id: str, symbol: str) -> bool:
         """撤单"""
-        try:
-            result = await self.current_client.cancel_order(order_id, symbol)
-            self._on_success()
-            return result
-        except Exception as e:
-            self._on_failure()
-            if self._should_switch():
-                self._switch_to_backup()
-                return await self.current_client.cancel_order(order_id, symbol)
-            raise
+        return await self._call("cancel_order", order_id, symbol)
+    
+    async def cancel_orders_batch(self, order_ids: list[str], symbol: str) -> list[bool]:
+        """批量撤单"""
+        return await self._call("cancel_orders_batch", order_ids, symbol)
+    
+    async def get_orders_status(self, order_ids: list[str], symbol: str) -> list[OrderStatus]:
+        """批量获取订单状态"""
+        return await self._call("get_orders_status", order_ids, symbol)
     
     async def get_position(self, symbol: str) -> Position:
         """获取仓位"""
-        return await self.current_client.get_position(symbol)
+        return await self._call("get_position", symbol)
     
     async def get_balance(self) -> float:
         """获取余额"""
-        return await self.current_client.get_balance()
+        return await self._call("get_balance")
+    
+    async def _call(self, method: str, *args: Any) -> Any:
+        """
+        经熔断器调用交易所方法
+        
+        主交易所失败导致熔断（或半开探测失败）时，本次请求转由备用交易所重试。
+        """
+        client, probing = self._select_client()
+        settled = False
+        try:
+            result = await getattr(client, method)(*args)
+            settled = True
+        except Exception:
+            if client is self.primary:
+                settled = True
+                self._on_failure(method, probing)
+                if self._state is CircuitState.OPEN and self.backup:
+                    return await getattr(self.backup, method)(*args)
+            raise
+        finally:
+            # 探测被取消（CancelledError 等）时不会经过 _on_failure，在此释放探测名额并重新熔断
+            if probing and not settled:
+                self._on_failure(method, probing)
+        
+        if client is self.primary:
+            self._on_success(method, probing)
+        return result
     
-    def _on_success(self) -> None:
-        """成功时重置计数"""
-        self._failure_count = 0
+    def _select_client(self) -> tuple[ExchangeClient, bool]:
+        """选择本次请求的客户端，返回 (客户端, 是否为半开探测)"""
+        if self._state is CircuitState.CLOSED or self.backup is None:
+            return self.primary, False
+        
+        if self._state is CircuitState.OPEN:
+            if time.monotonic() < self._open_until:
+                return self.backup, False
+            self._state = CircuitState.HALF_OPEN
+            logger.info("熔断冷却结束，探测主交易所")
+        
+        # 半开：同一时刻只放行一个探测请求，其余继续走备用
+        if self._probe_in_flight:
+            return self.backup, False
+        self._probe_in_flight = True
+        return self.primary, True
     
-    def _on_failure(self) -> None:
-        """失败时增加计数"""
-        self._failure_count += 1
-        logger.warning(f"交易所请求失败，计数: {self._failure_count}")
+    def _on_success(self, method: str, probing: bool) -> None:
+        """成功时重置该方法的计数，探测成功则切回主交易所"""
+        self._failure_by_method[method] = 0
+        if probing:
+            self.switch_to_primary()
     
-    def _should_switch(self) -> bool:
+    def _on_failure(self, method: str, probing: bool) -> None:
+        """失败时增加该方法的计数，达到阈值或探测失败则熔断"""
+        if probing:
+            self._probe_in_flight = False
+            self._open_circuit("主交易所探测失败，继续使用备用交易所")
+            return
+        
+        count = self._failure_by_method.get(method, 0) + 1
+        self._failure_by_method[method] = count
+        logger.warning(f"交易所请求失败: {method}, 计数: {count}")
+        
+        if self._should_switch(method):
+            self._switch_to_backup()
+    
+    def _should_switch(self, method: str) -> bool:
         """是否应该切换"""
         return (
-            self._failure_count >= self._max_failures
+            self._failure_by_method.get(method, 0) >= self._max_failures
             and self.backup is not None
-            and not self._use_backup
+            and self._state is CircuitState.CLOSED
         )
     
+    def _open_circuit(self, reason: str) -> None:
+        """进入熔断状态，冷却期内使用备用交易所"""
+        self._state = CircuitState.OPEN
+        self._open_until = time.monotonic() + self._recovery_timeout
+        logger.warning(reason)
+    
     def _switch_to_backup(self) -> None:
         """切换到备用"""
         if self.backup:
-            self._use_backup = True
-            self._failure_count = 0
-            logger.warning("切换到备用交易所")
+            self._failure_by_method.clear()
+            self._open_circuit("切换到备用交易所")
     
     def switch_to_primary(self) -> None:
         """切换回主交易所"""
-        self._use_backup = False
-        self._failure_count = 0
+        self._state = CircuitState.CLOSED
+        self._probe_in_flight = False
+        self._failure_by_method.clear()
         logger.info("切换回主交易所")
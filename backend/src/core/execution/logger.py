@@ -4,27 +4,97 @@ BTC 自动交易系统 — 执行日志器
 记录订单、执行结果和审计追踪。
 """
 
+import asyncio
+import itertools
+import logging
+import time
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from datetime import datetime
+from itertools import islice
 from typing import Any
 
 from src.common.enums import OrderStatus
 from src.common.logging import get_logger
 from src.common.models import ExecutionResult, Order
-from src.common.utils import utc_now
+from src.common.utils import from_utc_ns
+
+from .constants import ExecutionConstants
 
 logger = get_logger(__name__)
 
+# 日志 ID：进程启动时刻前缀 + 进程内递增序号，避免每条日志生成 uuid4
+_LOG_ID_PREFIX = f"{time.time_ns():x}-"
+_log_seq = itertools.count(1)
+
+# 事件类型 -> (日志级别, 格式串)；格式串第一个参数为订单 ID
+_EVENT_LOG_FORMATS: dict[str, tuple[int, str]] = {
+    "ORDER_SUBMITTED": (logging.INFO, "订单提交: %s"),
+    "ORDER_FILLED": (logging.INFO, "订单成交: %s, 价格: %s"),
+    "ORDER_CANCELLED": (logging.INFO, "订单撤销: %s, 原因: %s"),
+    "ORDER_REJECTED": (logging.WARNING, "订单拒绝: %s, 原因: %s"),
+    "EXECUTION_ERROR": (logging.ERROR, "执行错误: %s, 错误: %s"),
+}
+
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionLogEntry:
-    """执行日志条目"""
+    """
+    执行日志条目
+    
+    提交/成交事件只保存订单或执行结果的引用，details 在读取时才生成；
+    时间戳以纳秒整数保存，读取时才转换为 datetime。
+    """
     log_id: str
     order_id: str
     event_type: str  # ORDER_SUBMITTED, ORDER_FILLED, ORDER_CANCELLED, etc.
     status: OrderStatus
-    details: dict[str, Any] = field(default_factory=dict)
-    timestamp: datetime = field(default_factory=utc_now)
+    source: Order | ExecutionResult | None = None
+    extra: dict[str, Any] | None = None
+    timestamp_ns: int = field(default_factory=time.time_ns)
+    
+    @property
+    def timestamp(self) -> datetime:
+        """记录时间（UTC）"""
+        return from_utc_ns(self.timestamp_ns)
+    
+    @property
+    def details(self) -> dict[str, Any]:
+        """事件详情"""
+        source = self.source
+        if isinstance(source, Order):
+            details = {
+                "symbol": source.symbol,
+                "side": source.side.value,
+                "type": source.order_type.value,
+                "quantity": source.quantity,
+                "price": source.price,
+                "strategy_id": source.strategy_id,
+            }
+        elif isinstance(source, ExecutionResult):
+            details = {
+                "executed_quantity": source.executed_quantity,
+                "executed_price": source.executed_price,
+                "slippage": source.slippage,
+                "commission": source.commission,
+                "flags": source.flags,
+            }
+        else:
+            details = {}
+        if self.extra:
+            details.update(self.extra)
+        return details
+    
+    def to_dict(self) -> dict[str, Any]:
+        """序列化为字典"""
+        return {
+            "log_id": self.log_id,
+            "order_id": self.order_id,
+            "event_type": self.event_type,
+            "status": self.status.value,
+            "details": self.details,
+            "timestamp": self.timestamp.isoformat(),
+        }
 
 
 class ExecutionLogger:
@@ -32,11 +102,19 @@ class ExecutionLogger:
     执行日志器
     
     记录所有执行相关的日志，支持审计追踪。
+    内存中只保留最近的日志（环形缓冲），超出容量的旧条目自动淘汰。
+    
+    审计条目同步写入内存；标准日志输出在事件循环中排队，
+    由下一轮循环批量写出，下单路径只承担入队开销。
     """
     
     def __init__(self):
-        self._logs: list[ExecutionLogEntry] = []
-        self._order_logs: dict[str, list[ExecutionLogEntry]] = {}
+        self._logs: deque[ExecutionLogEntry] = deque(maxlen=ExecutionConstants.MAX_LOG_ENTRIES)
+        self._order_logs: OrderedDict[str, deque[ExecutionLogEntry]] = OrderedDict()
+        # 待输出的标准日志：(事件类型, 订单 ID, 格式参数)
+        self._pending: deque[tuple[str, str, tuple]] = deque()
+        self._flush_scheduled = False
+        self.dropped_count = 0
     
     def log_order_submitted(self, order: Order) -> None:
         """记录订单提交"""
@@ -44,20 +122,10 @@ class ExecutionLogger:
             order_id=order.order_id,
             event_type="ORDER_SUBMITTED",
             status=OrderStatus.SUBMITTED,
-            details={
-                "symbol": order.symbol,
-                "side": order.side.value,
-                "type": order.order_type.value,
-                "quantity": order.quantity,
-                "price": order.price,
-                "strategy_id": order.strategy_id,
-            },
+            source=order,
         )
         self._add_entry(entry)
-        logger.info(
-            f"订单提交: {order.order_id}",
-            extra={"order_id": order.order_id, "event": "ORDER_SUBMITTED"},
-        )
+        self._emit("ORDER_SUBMITTED", order.order_id)
     
     def log_order_filled(self, order_id: str, result: ExecutionResult) -> None:
         """记录订单成交"""
@@ -65,19 +133,10 @@ class ExecutionLogger:
             order_id=order_id,
             event_type="ORDER_FILLED",
             status=result.status,
-            details={
-                "executed_quantity": result.executed_quantity,
-                "executed_price": result.executed_price,
-                "slippage": result.slippage,
-                "commission": result.commission,
-                "flags": result.flags,
-            },
+            source=result,
         )
         self._add_entry(entry)
-        logger.info(
-            f"订单成交: {order_id}, 价格: {result.executed_price}",
-            extra={"order_id": order_id, "event": "ORDER_FILLED"},
-        )
+        self._emit("ORDER_FILLED", order_id, result.executed_price)
     
     def log_order_cancelled(self, order_id: str, reason: str) -> None:
         """记录订单撤销"""
@@ -85,13 +144,10 @@ class ExecutionLogger:
             order_id=order_id,
             event_type="ORDER_CANCELLED",
             status=OrderStatus.CANCELLED,
-            details={"reason": reason},
+            extra={"reason": reason},
         )
         self._add_entry(entry)
-        logger.info(
-            f"订单撤销: {order_id}, 原因: {reason}",
-            extra={"order_id": order_id, "event": "ORDER_CANCELLED"},
-        )
+        self._emit("ORDER_CANCELLED", order_id, reason)
     
     def log_order_rejected(self, order_id: str, reason: str) -> None:
         """记录订单拒绝"""
@@ -99,13 +155,10 @@ class ExecutionLogger:
             order_id=order_id,
             event_type="ORDER_REJECTED",
             status=OrderStatus.REJECTED,
-            details={"reason": reason},
+            extra={"reason": reason},
         )
         self._add_entry(entry)
-        logger.warning(
-            f"订单拒绝: {order_id}, 原因: {reason}",
-            extra={"order_id": order_id, "event": "ORDER_REJECTED"},
-        )
+        self._emit("ORDER_REJECTED", order_id, reason)
     
     def log_execution_error(self, order_id: str, error: str) -> None:
         """记录执行错误"""
@@ -113,43 +166,94 @@ class ExecutionLogger:
             order_id=order_id,
             event_type="EXECUTION_ERROR",
             status=OrderStatus.REJECTED,
-            details={"error": error},
+            extra={"error": error},
         )
         self._add_entry(entry)
-        logger.error(
-            f"执行错误: {order_id}, 错误: {error}",
-            extra={"order_id": order_id, "event": "EXECUTION_ERROR"},
-        )
+        self._emit("EXECUTION_ERROR", order_id, error)
+    
+    def flush(self) -> None:
+        """输出所有排队中的标准日志"""
+        self._flush_scheduled = False
+        pending = self._pending
+        log = logger.log
+        while pending:
+            event, order_id, args = pending.popleft()
+            level, msg = _EVENT_LOG_FORMATS[event]
+            log(level, msg, order_id, *args, extra={"order_id": order_id, "event": event})
+        
+        if self.dropped_count:
+            logger.warning(f"日志队列积压，已丢弃 {self.dropped_count} 条 INFO 日志")
+            self.dropped_count = 0
+    
+    def _emit(self, event: str, order_id: str, *args: Any) -> None:
+        """
+        排队输出标准日志
+        
+        只入队事件类型与参数，级别、格式串和 extra 在输出时才确定。
+        无运行中的事件循环时直接输出；积压超过高水位时丢弃 INFO 级别日志，
+        WARNING 及以上始终保留。
+        """
+        level = _EVENT_LOG_FORMATS[event][0]
+        if not logger.isEnabledFor(level):
+            return
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._pending.append((event, order_id, args))
+            self.flush()
+            return
+        
+        if len(self._pending) >= ExecutionConstants.LOG_QUEUE_HIGH_WATERMARK and level < logging.WARNING:
+            self.dropped_count += 1
+            return
+        
+        self._pending.append((event, order_id, args))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self.flush)
     
     def get_order_history(self, order_id: str) -> list[ExecutionLogEntry]:
         """获取订单历史"""
-        return self._order_logs.get(order_id, [])
+        return list(self._order_logs.get(order_id, ()))
     
     def get_recent_logs(self, limit: int = 100) -> list[ExecutionLogEntry]:
         """获取最近日志"""
-        return self._logs[-limit:]
+        logs = self._logs
+        if limit <= 0:
+            return []
+        if limit >= len(logs):
+            return list(logs)
+        return list(islice(logs, len(logs) - limit, None))
     
     def _create_entry(
         self,
         order_id: str,
         event_type: str,
         status: OrderStatus,
-        details: dict[str, Any],
+        source: Order | ExecutionResult | None = None,
+        extra: dict[str, Any] | None = None,
     ) -> ExecutionLogEntry:
         """创建日志条目"""
-        import uuid
         return ExecutionLogEntry(
-            log_id=str(uuid.uuid4()),
+            log_id=f"{_LOG_ID_PREFIX}{next(_log_seq)}",
             order_id=order_id,
             event_type=event_type,
             status=status,
-            details=details,
+            source=source,
+            extra=extra,
         )
     
     def _add_entry(self, entry: ExecutionLogEntry) -> None:
         """添加日志条目"""
         self._logs.append(entry)
         
-        if entry.order_id not in self._order_logs:
-            self._order_logs[entry.order_id] = []
-        self._order_logs[entry.order_id].append(entry)
+        order_logs = self._order_logs.get(entry.order_id)
+        if order_logs is None:
+            order_logs = self._order_logs[entry.order_id] = deque(
+                maxlen=ExecutionConstants.MAX_LOG_ENTRIES_PER_ORDER
+            )
+            # 超出跟踪上限时淘汰最早的订单
+            if len(self._order_logs) > ExecutionConstants.MAX_TRACKED_ORDER_LOGS:
+                self._order_logs.popitem(last=False)
+        order_logs.append(entry)
@@ -5,12 +5,13 @@ BTC 自动交易系统 — 多用户执行器
 """
 
 import asyncio
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
 from src.common.logging import get_logger
-from src.common.utils import utc_now
+from src.common.utils import from_utc_ns
 from src.user.context import TradingSignal, UserContext, UserExecutionResult
 from src.user.manager import UserManager
 from src.user.models import User, UserExchangeConfig, UserRiskState
@@ -18,7 +19,7 @@ from src.user.models import User, UserExchangeConfig, UserRiskState
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class BroadcastResult:
     """广播结果"""
     signal_id: str
@@ -27,7 +28,12 @@ class BroadcastResult:
     failed_count: int
     skipped_count: int
     results: dict[str, UserExecutionResult] = field(default_factory=dict)
-    timestamp: datetime = field(default_factory=utc_now)
+    timestamp_ns: int = field(default_factory=time.time_ns)
+    
+    @property
+    def timestamp(self) -> datetime:
+        """广播时间（UTC）"""
+        return from_utc_ns(self.timestamp_ns)
     
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -55,7 +61,7 @@ class MultiUserExecutor:
         self.user_manager = user_manager
         self._contexts: dict[str, UserContext] = {}
         self._initialized = False
-        self._execution_timeout = 30.0  # 单用户执行超时
+        self._execution_timeout = 30.0  # 广播截止时间，超时未完成的用户执行被取消
     
     @property
     def active_count(self) -> int:
@@ -97,12 +103,18 @@ class MultiUserExecutor:
         return success_count
     
     async def shutdown_all(self) -> None:
-        """关闭所有用户上下文"""
-        for context in self._contexts.values():
-            try:
-                await context.shutdown()
-            except Exception as e:
-                logger.error(f"用户关闭异常: {context.user_id}, error={e}")
+        """关闭所有用户上下文（并行关闭）"""
+        contexts = list(self._contexts.values())
+        outcomes = await asyncio.gather(
+            *(context.shutdown() for context in contexts),
+            return_exceptions=True,
+        )
+        for context, outcome in zip(contexts, outcomes):
+            # 单个关闭任务被取消时 outcome 为 CancelledError（BaseException）
+            if isinstance(outcome, asyncio.CancelledError):
+                logger.error(f"用户关闭已取消: {context.user_id}")
+            elif isinstance(outcome, BaseException):
+                logger.error(f"用户关闭异常: {context.user_id}, error={outcome}")
         
         self._contexts.clear()
         self._initialized = False
@@ -135,31 +147,51 @@ class MultiUserExecutor:
             logger.warning(f"无可交易用户，信号 {signal.signal_id} 跳过")
             return result
         
-        # 并行执行
-        tasks = []
-        for context in tradeable_contexts:
-            task = self._execute_with_timeout(context, signal)
-            tasks.append((context.user_id, task))
+        # 并行执行，整个广播共用一个截止时间；单用户异常作为结果返回，不影响其他用户
+        tasks = {
+            c.user_id: asyncio.create_task(c.execute_signal(signal))
+            for c in tradeable_contexts
+        }
+        try:
+            _, pending = await asyncio.wait(tasks.values(), timeout=self._execution_timeout)
+        finally:
+            # 超时或广播本身被取消时，取消并回收未完成的任务，避免泄漏
+            stragglers = [t for t in tasks.values() if not t.done()]
+            for task in stragglers:
+                task.cancel()
+            if stragglers:
+                await asyncio.gather(*stragglers, return_exceptions=True)
         
-        # 等待所有任务完成
-        for user_id, task in tasks:
-            try:
-                exec_result = await task
-                result.results[user_id] = exec_result
-                
-                if exec_result.success:
-                    result.success_count += 1
-                else:
-                    result.failed_count += 1
-                    
-            except Exception as e:
-                logger.error(f"用户 {user_id} 执行异常: {e}")
-                result.results[user_id] = UserExecutionResult(
+        for user_id, task in tasks.items():
+            if task in pending:
+                outcome = UserExecutionResult(
+                    user_id=user_id,
+                    signal_id=signal.signal_id,
+                    success=False,
+                    error="执行超时",
+                )
+            elif task.cancelled():
+                outcome = UserExecutionResult(
+                    user_id=user_id,
+                    signal_id=signal.signal_id,
+                    success=False,
+                    error="执行已取消",
+                )
+            elif task.exception() is not None:
+                logger.error(f"用户 {user_id} 执行异常: {task.exception()}")
+                outcome = UserExecutionResult(
                     user_id=user_id,
                     signal_id=signal.signal_id,
                     success=False,
-                    error=str(e),
+                    error=str(task.exception()),
                 )
+            else:
+                outcome = task.result()
+            
+            result.results[user_id] = outcome
+            if outcome.success:
+                result.success_count += 1
+            else:
                 result.failed_count += 1
         
         logger.info(
@@ -169,25 +201,6 @@ class MultiUserExecutor:
         
         return result
     
-    async def _execute_with_timeout(
-        self,
-        context: UserContext,
-        signal: TradingSignal,
-    ) -> UserExecutionResult:
-        """带超时的执行"""
-        try:
-            return await asyncio.wait_for(
-                context.execute_signal(signal),
-                timeout=self._execution_timeout,
-            )
-        except asyncio.TimeoutError:
-            return UserExecutionResult(
-                user_id=context.user_id,
-                signal_id=signal.signal_id,
-                success=False,
-                error="执行超时",
-            )
-    
     async def add_user(self, user_id: str) -> bool:
         """
         添加用户
@@ -267,13 +280,23 @@ class MultiUserExecutor:
     
     def get_all_status(self) -> dict[str, Any]:
         """获取所有用户状态"""
+        users: dict[str, Any] = {}
+        active = 0
+        # 单次遍历，避免逐个用户再经 get_user_status 查找上下文
+        for user_id, context in self._contexts.items():
+            is_tradeable = context.is_tradeable
+            active += is_tradeable
+            users[user_id] = {
+                "user_id": user_id,
+                "is_initialized": context.is_initialized,
+                "is_tradeable": is_tradeable,
+                "risk_state": context.risk_state.to_dict(),
+            }
+        
         return {
-            "total_users": self.total_count,
-            "active_users": self.active_count,
-            "users": {
-                user_id: self.get_user_status(user_id)
-                for user_id in self._contexts
-            },
+            "total_users": len(self._contexts),
+            "active_users": active,
+            "users": users,
         }
     
     async def close_all_positions(self, symbol: str = "BTCUSDT") -> dict[str, UserExecutionResult]:
@@ -286,18 +309,24 @@ class MultiUserExecutor:
         Returns:
             用户 ID -> 执行结果
         """
-        results = {}
+        # 紧急平仓时并行发出，总耗时取决于最慢的用户
+        user_ids = list(self._contexts)
+        outcomes = await asyncio.gather(
+            *(self._contexts[user_id].close_position(symbol) for user_id in user_ids),
+            return_exceptions=True,
+        )
         
-        for user_id, context in self._contexts.items():
-            try:
-                result = await context.close_position(symbol)
-                results[user_id] = result
-            except Exception as e:
-                results[user_id] = UserExecutionResult(
+        results = {}
+        for user_id, outcome in zip(user_ids, outcomes):
+            # 单个平仓任务被取消时 outcome 为 CancelledError（BaseException），同样记为失败
+            if isinstance(outcome, BaseException):
+                cancelled = isinstance(outcome, asyncio.CancelledError)
+                outcome = UserExecutionResult(
                     user_id=user_id,
                     signal_id="close_all",
                     success=False,
-                    error=str(e),
+                    error="执行已取消" if cancelled else str(outcome),
                 )
+            results[user_id] = outcome
         
         return results
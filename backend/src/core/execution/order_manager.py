@@ -5,28 +5,48 @@ BTC 自动交易系统 — 订单管理器
 """
 
 import asyncio
+import heapq
+import time
+from collections import defaultdict
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Any
 
 from src.common.enums import OrderStatus
 from src.common.logging import get_logger
 from src.common.models import Order
-from src.common.utils import utc_now
+from src.common.utils import from_utc_ns
 
 from .constants import ExecutionConstants
 from .exchange import ExchangeManager
 
 logger = get_logger(__name__)
 
+# 订单终态
+_TERMINAL_STATUSES = frozenset({
+    OrderStatus.FILLED,
+    OrderStatus.CANCELLED,
+    OrderStatus.REJECTED,
+})
 
-@dataclass
+
+@dataclass(slots=True)
 class TrackedOrder:
-    """跟踪中的订单"""
+    """跟踪中的订单（时间以纳秒整数保存）"""
     order: Order
-    submitted_at: datetime = field(default_factory=utc_now)
-    last_checked: datetime = field(default_factory=utc_now)
+    submitted_at_ns: int = field(default_factory=time.time_ns)
+    last_checked_ns: int = field(default_factory=time.time_ns)
     check_count: int = 0
+    
+    @property
+    def submitted_at(self) -> datetime:
+        """提交时间（UTC）"""
+        return from_utc_ns(self.submitted_at_ns)
+    
+    @property
+    def last_checked(self) -> datetime:
+        """最近检查时间（UTC）"""
+        return from_utc_ns(self.last_checked_ns)
 
 
 class OrderManager:
@@ -34,13 +54,19 @@ class OrderManager:
     订单管理器
     
     管理订单状态跟踪、超时处理和撤销。
+    
+    订单表只在同步代码段中修改（事件循环内天然原子），不使用全局锁；
+    撤单需等待交易所响应，按订单加锁避免同一订单重复撤销。
     """
     
     def __init__(self, exchange: ExchangeManager):
         self.exchange = exchange
         self._pending_orders: dict[str, TrackedOrder] = {}
         self._completed_orders: dict[str, Order] = {}
-        self._lock = asyncio.Lock()
+        self._order_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # 超时堆：(截止时间纳秒, 订单 ID)，订单完成后不主动删除，弹出时跳过
+        self._timeout_heap: list[tuple[int, str]] = []
+        self._timeout_ns = ExecutionConstants.timeout.order_confirm_ms * 1_000_000
     
     @property
     def pending_count(self) -> int:
@@ -57,25 +83,29 @@ class OrderManager:
         Returns:
             订单 ID
         """
-        async with self._lock:
-            # 检查是否超过最大待处理数
-            if self.pending_count >= ExecutionConstants.MAX_PENDING_ORDERS:
-                raise RuntimeError(f"待处理订单数超过上限: {ExecutionConstants.MAX_PENDING_ORDERS}")
-            
-            # 检查幂等性
-            if order.order_id in self._pending_orders:
-                logger.warning(f"订单已存在: {order.order_id}")
-                return order.order_id
-            
-            if order.order_id in self._completed_orders:
-                logger.warning(f"订单已完成: {order.order_id}")
-                return order.order_id
-            
-            # 添加到跟踪列表
-            self._pending_orders[order.order_id] = TrackedOrder(order=order)
-            logger.info(f"订单已提交: {order.order_id}")
-            
+        # 检查是否超过最大待处理数
+        if self.pending_count >= ExecutionConstants.MAX_PENDING_ORDERS:
+            raise RuntimeError(f"待处理订单数超过上限: {ExecutionConstants.MAX_PENDING_ORDERS}")
+        
+        # 检查幂等性
+        if order.order_id in self._pending_orders:
+            logger.warning(f"订单已存在: {order.order_id}")
+            return order.order_id
+        
+        if order.order_id in self._completed_orders:
+            logger.warning(f"订单已完成: {order.order_id}")
             return order.order_id
+        
+        # 添加到跟踪列表
+        tracked = TrackedOrder(order=order)
+        self._pending_orders[order.order_id] = tracked
+        heapq.heappush(
+            self._timeout_heap,
+            (tracked.submitted_at_ns + self._timeout_ns, order.order_id),
+        )
+        logger.info(f"订单已提交: {order.order_id}")
+        
+        return order.order_id
     
     async def get_order_status(self, order_id: str) -> OrderStatus:
         """获取订单状态"""
@@ -87,12 +117,51 @@ class OrderManager:
             status = await self.exchange.current_client.get_order_status(
                 order_id, tracked.order.symbol
             )
-            tracked.last_checked = utc_now()
+            tracked.last_checked_ns = time.time_ns()
             tracked.check_count += 1
             return status
         
         return OrderStatus.PENDING
     
+    async def poll_pending(self) -> dict[str, OrderStatus]:
+        """
+        批量轮询待处理订单状态
+        
+        按交易对分组，每个交易对一次批量查询，各交易对并发；
+        已进入终态的订单标记完成。
+        
+        Returns:
+            订单 ID -> 最新状态
+        """
+        by_symbol: dict[str, list[str]] = {}
+        for order_id, tracked in self._pending_orders.items():
+            by_symbol.setdefault(tracked.order.symbol, []).append(order_id)
+        
+        batches = list(by_symbol.items())
+        batch_results = await asyncio.gather(
+            *(self.exchange.get_orders_status(order_ids, symbol) for symbol, order_ids in batches),
+            return_exceptions=True,
+        )
+        
+        now = time.time_ns()
+        statuses: dict[str, OrderStatus] = {}
+        for (symbol, order_ids), results in zip(batches, batch_results):
+            if isinstance(results, Exception):
+                logger.error(f"批量查询订单状态失败: {symbol}, {results}")
+                continue
+            
+            for order_id, status in zip(order_ids, results):
+                statuses[order_id] = status
+                tracked = self._pending_orders.get(order_id)
+                if tracked is None:
+                    continue
+                tracked.last_checked_ns = now
+                tracked.check_count += 1
+                if status in _TERMINAL_STATUSES:
+                    await self.mark_completed(order_id, status)
+        
+        return statuses
+    
     async def cancel_order(self, order_id: str, reason: str = "") -> bool:
         """
         撤销订单
@@ -104,22 +173,28 @@ class OrderManager:
         Returns:
             是否成功
         """
-        async with self._lock:
-            if order_id not in self._pending_orders:
-                logger.warning(f"订单不存在或已完成: {order_id}")
-                return False
-            
-            tracked = self._pending_orders[order_id]
-            
-            success = await self.exchange.cancel_order(order_id, tracked.order.symbol)
-            
-            if success:
-                tracked.order.status = OrderStatus.CANCELLED
-                self._completed_orders[order_id] = tracked.order
-                del self._pending_orders[order_id]
-                logger.info(f"订单已撤销: {order_id}, 原因: {reason}")
-            
-            return success
+        # 只为待处理订单建锁，锁在订单离开待处理表时回收
+        if order_id not in self._pending_orders:
+            logger.warning(f"订单不存在或已完成: {order_id}")
+            return False
+        
+        async with self._order_locks[order_id]:
+            return await self._cancel_locked(order_id, reason)
+    
+    async def _cancel_locked(self, order_id: str, reason: str) -> bool:
+        """撤销订单（调用方已持有该订单的锁）"""
+        tracked = self._pending_orders.get(order_id)
+        if tracked is None:
+            logger.warning(f"订单不存在或已完成: {order_id}")
+            return False
+        
+        success = await self.exchange.cancel_order(order_id, tracked.order.symbol)
+        
+        # 撤单期间订单可能已被标记完成
+        if success and self._complete(order_id, OrderStatus.CANCELLED):
+            logger.info(f"订单已撤销: {order_id}, 原因: {reason}")
+        
+        return success
     
     async def cancel_all_pending(self, reason: str = "批量撤销") -> int:
         """
@@ -128,12 +203,42 @@ class OrderManager:
         Returns:
             撤销成功的数量
         """
+        # 一次性快照，按交易对分组；正在单独撤销的订单跳过，
+        # 其余订单持有撤单锁直到批量撤单结束，避免与 cancel_order 重复撤单
+        by_symbol: dict[str, list[str]] = {}
+        held: list[asyncio.Lock] = []
+        for order_id, tracked in list(self._pending_orders.items()):
+            lock = self._order_locks[order_id]
+            if lock.locked():
+                continue
+            await lock.acquire()
+            held.append(lock)
+            by_symbol.setdefault(tracked.order.symbol, []).append(order_id)
+        
+        try:
+            # 各交易对的批量撤单并发发出，单个交易对失败不影响其他
+            batches = list(by_symbol.items())
+            batch_results = await asyncio.gather(
+                *(self.exchange.cancel_orders_batch(order_ids, symbol) for symbol, order_ids in batches),
+                return_exceptions=True,
+            )
+        finally:
+            for lock in held:
+                lock.release()
+        
         cancelled = 0
-        order_ids = list(self._pending_orders.keys())
+        for (symbol, order_ids), results in zip(batches, batch_results):
+            if isinstance(results, Exception):
+                logger.error(f"批量撤单失败: {symbol}, {results}")
+                continue
+            
+            for order_id, success in zip(order_ids, results):
+                # 撤单期间订单可能已被标记完成
+                if success and self._complete(order_id, OrderStatus.CANCELLED):
+                    cancelled += 1
         
-        for order_id in order_ids:
-            if await self.cancel_order(order_id, reason):
-                cancelled += 1
+        if cancelled:
+            logger.info(f"批量撤销订单: {cancelled} 个, 原因: {reason}")
         
         return cancelled
     
@@ -143,13 +248,23 @@ class OrderManager:
         status: OrderStatus,
     ) -> None:
         """标记订单完成"""
-        async with self._lock:
-            if order_id in self._pending_orders:
-                tracked = self._pending_orders[order_id]
-                tracked.order.status = status
-                self._completed_orders[order_id] = tracked.order
-                del self._pending_orders[order_id]
-                logger.info(f"订单已完成: {order_id}, 状态: {status.value}")
+        if self._complete(order_id, status):
+            logger.info(f"订单已完成: {order_id}, 状态: {status.value}")
+    
+    def _complete(self, order_id: str, status: OrderStatus) -> bool:
+        """
+        将订单移出待处理表并记录终态，同时回收其撤单锁
+        
+        Returns:
+            订单是否仍在待处理表中（已完成的订单返回 False）
+        """
+        tracked = self._pending_orders.pop(order_id, None)
+        if tracked is None:
+            return False
+        tracked.order.status = status
+        self._completed_orders[order_id] = tracked.order
+        self._order_locks.pop(order_id, None)
+        return True
     
     def get_pending_orders(self) -> list[Order]:
         """获取所有待处理订单"""
@@ -171,17 +286,18 @@ class OrderManager:
         """
         检查超时订单
         
+        只弹出已到期的堆顶条目，每个超时订单只返回一次。
+        
         Returns:
             超时订单 ID 列表
         """
-        timeout_ms = ExecutionConstants.timeout.order_confirm_ms
-        timeout_delta = timedelta(milliseconds=timeout_ms)
-        
+        heap = self._timeout_heap
         timed_out: list[str] = []
-        now = utc_now()
+        now = time.time_ns()
         
-        for order_id, tracked in self._pending_orders.items():
-            if now - tracked.submitted_at > timeout_delta:
+        while heap and heap[0][0] < now:
+            _, order_id = heapq.heappop(heap)
+            if order_id in self._pending_orders:
                 timed_out.append(order_id)
         
         return timed_out
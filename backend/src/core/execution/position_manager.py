@@ -5,12 +5,13 @@ BTC 自动交易系统 — 仓位管理器
 """
 
 import asyncio
+import time
 from dataclasses import dataclass
 from datetime import datetime
 
 from src.common.logging import get_logger
 from src.common.models import Order
-from src.common.utils import utc_now
+from src.common.utils import from_utc_ns
 from src.core.risk.constants import RiskThresholds
 
 from .constants import ExecutionConstants
@@ -19,12 +20,17 @@ from .exchange import ExchangeManager, Position
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PositionSnapshot:
     """仓位快照"""
     position: Position
     balance: float
-    timestamp: datetime
+    timestamp_ns: int
+    
+    @property
+    def timestamp(self) -> datetime:
+        """快照时间（UTC）"""
+        return from_utc_ns(self.timestamp_ns)
 
 
 class PositionManager:
@@ -46,13 +52,18 @@ class PositionManager:
         
         self._cached_position: Position | None = None
         self._cached_balance: float = 0.0
-        self._last_sync: datetime | None = None
+        self._last_sync: float | None = None  # time.monotonic()
         self._lock = asyncio.Lock()
     
     async def get_current_position(self, symbol: str = "BTCUSDT") -> Position:
         """获取当前仓位"""
+        # 快速路径：缓存有效时无需加锁
+        cached = self._cached_position
+        if cached is not None and not self._should_sync():
+            return cached
+        
         async with self._lock:
-            # 检查缓存是否过期
+            # 加锁后再次检查，其他协程可能已完成同步
             if self._should_sync():
                 await self._sync_position(symbol)
             
@@ -62,6 +73,9 @@ class PositionManager:
     
     async def get_balance(self) -> float:
         """获取可用余额"""
+        if not self._should_sync():
+            return self._cached_balance
+        
         async with self._lock:
             if self._should_sync():
                 await self._sync_balance()
@@ -82,27 +96,28 @@ class PositionManager:
             return False, "余额不足"
         
         position = await self.get_current_position(order.symbol)
+        max_single = self.max_single_position
+        max_total = self.max_total_position
+        entry_price = position.entry_price
         
-        # 计算订单价值占比
-        order_value = order.quantity * (order.price or 0)
-        if order_value <= 0:
-            # 市价单，使用当前仓位价格估算
-            order_value = order.quantity * position.entry_price if position.entry_price > 0 else 0
+        # 计算订单价值占比；市价单使用当前仓位价格估算
+        price = order.price or entry_price
+        if price <= 0:
+            # 市价单且无持仓价格：订单与持仓价值均为 0，两项限制必然通过
+            return True, "通过"
         
-        order_ratio = order_value / balance if balance > 0 else 0
+        order_value = order.quantity * price
+        inv_balance = 1.0 / balance  # 上面已保证 balance > 0
+        order_ratio = order_value * inv_balance
         
         # 检查单笔限制
-        if order_ratio > self.max_single_position:
-            return False, f"单笔仓位 {order_ratio:.2%} 超过限制 {self.max_single_position:.2%}"
-        
-        # 计算总仓位
-        current_value = position.quantity * position.entry_price
-        current_ratio = current_value / balance if balance > 0 else 0
-        total_ratio = current_ratio + order_ratio
+        if order_ratio > max_single:
+            return False, f"单笔仓位 {order_ratio:.2%} 超过限制 {max_single:.2%}"
         
         # 检查总仓位限制
-        if total_ratio > self.max_total_position:
-            return False, f"总仓位 {total_ratio:.2%} 超过限制 {self.max_total_position:.2%}"
+        total_ratio = (position.quantity * entry_price + order_value) * inv_balance
+        if total_ratio > max_total:
+            return False, f"总仓位 {total_ratio:.2%} 超过限制 {max_total:.2%}"
         
         return True, "通过"
     
@@ -122,14 +137,14 @@ class PositionManager:
                     symbol=symbol, side="NONE", quantity=0, entry_price=0
                 ),
                 balance=self._cached_balance,
-                timestamp=utc_now(),
+                timestamp_ns=time.time_ns(),
             )
     
     async def _sync_position(self, symbol: str) -> None:
         """内部同步仓位"""
         try:
             self._cached_position = await self.exchange.get_position(symbol)
-            self._last_sync = utc_now()
+            self._last_sync = time.monotonic()
             logger.info(
                 f"仓位同步: {symbol}, 方向: {self._cached_position.side}, "
                 f"数量: {self._cached_position.quantity}"
@@ -147,11 +162,11 @@ class PositionManager:
     
     def _should_sync(self) -> bool:
         """是否需要同步"""
-        if self._last_sync is None:
-            return True
-        
-        elapsed = (utc_now() - self._last_sync).total_seconds()
-        return elapsed > ExecutionConstants.POSITION_SYNC_INTERVAL
+        last_sync = self._last_sync
+        return (
+            last_sync is None
+            or time.monotonic() - last_sync > ExecutionConstants.POSITION_SYNC_INTERVAL
+        )
     
     def get_position_ratio(self) -> float:
         """获取当前仓位占比"""
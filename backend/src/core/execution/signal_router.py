@@ -4,7 +4,7 @@ BTC 自动交易系统 — 信号路由器
 将策略信号路由到多用户执行器。
 """
 
-import uuid
+import secrets
 from typing import Any
 
 from src.common.logging import get_logger
@@ -57,7 +57,7 @@ class SignalRouter:
         
         # 创建交易信号
         signal = TradingSignal(
-            signal_id=str(uuid.uuid4())[:8],
+            signal_id=secrets.token_hex(4),
             symbol=self._default_symbol,
             direction=direction,
             confidence=aggregated_confidence,
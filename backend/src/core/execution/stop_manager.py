@@ -4,17 +4,23 @@ BTC 自动交易系统 — 止盈止损管理器
 管理止损、止盈设置和触发检测。
 """
 
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Any
 
 from src.common.logging import get_logger
-from src.common.utils import utc_now
+from src.common.utils import from_utc_ns
 
 logger = get_logger(__name__)
 
 
+def _side_sign(side: str) -> int:
+    """方向符号：LONG 为 1，SHORT 为 -1"""
+    return 1 if side == "LONG" else -1
+
+
 class TriggerType(str, Enum):
     """触发类型"""
     STOP_LOSS = "stop_loss"
@@ -22,7 +28,7 @@ class TriggerType(str, Enum):
     TRAILING_STOP = "trailing_stop"
 
 
-@dataclass
+@dataclass(slots=True)
 class StopConfig:
     """止损止盈配置"""
     position_id: str
@@ -32,17 +38,32 @@ class StopConfig:
     stop_loss_price: float | None = None
     take_profit_price: float | None = None
     trailing_stop_percent: float | None = None
-    created_at: datetime = field(default_factory=utc_now)
+    extreme_price: float | None = None  # 追踪止损用：LONG 为最高价，SHORT 为最低价
+    created_at_ns: int = field(default_factory=time.time_ns)
+    side_sign: int = field(init=False, default=1)  # 由 side 派生，LONG: 1, SHORT: -1
+    
+    def __post_init__(self) -> None:
+        self.side_sign = _side_sign(self.side)
+    
+    @property
+    def created_at(self) -> datetime:
+        """创建时间（UTC）"""
+        return from_utc_ns(self.created_at_ns)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TriggerEvent:
     """触发事件"""
     position_id: str
     trigger_type: TriggerType
     trigger_price: float
     current_price: float
-    timestamp: datetime = field(default_factory=utc_now)
+    timestamp_ns: int = field(default_factory=time.time_ns)
+    
+    @property
+    def timestamp(self) -> datetime:
+        """触发时间（UTC）"""
+        return from_utc_ns(self.timestamp_ns)
 
 
 class StopManager:
@@ -54,10 +75,10 @@ class StopManager:
     
     def __init__(self):
         self._configs: dict[str, StopConfig] = {}
-        self._highest_prices: dict[str, float] = {}  # 用于追踪止损
-        self._lowest_prices: dict[str, float] = {}
+        # 交易对 -> {仓位 ID: 配置}，检查时只遍历有报价的交易对
+        self._by_symbol: dict[str, dict[str, StopConfig]] = {}
     
-    async def set_stop_loss(
+    def set_stop_loss(
         self,
         position_id: str,
         symbol: str,
@@ -78,17 +99,17 @@ class StopManager:
         if position_id in self._configs:
             self._configs[position_id].stop_loss_price = stop_loss_price
         else:
-            self._configs[position_id] = StopConfig(
+            self._add_config(StopConfig(
                 position_id=position_id,
                 symbol=symbol,
                 side=side,
                 entry_price=entry_price,
                 stop_loss_price=stop_loss_price,
-            )
+            ))
         
         logger.info(f"设置止损: {position_id}, 价格: {stop_loss_price}")
     
-    async def set_take_profit(
+    def set_take_profit(
         self,
         position_id: str,
         symbol: str,
@@ -109,17 +130,17 @@ class StopManager:
         if position_id in self._configs:
             self._configs[position_id].take_profit_price = take_profit_price
         else:
-            self._configs[position_id] = StopConfig(
+            self._add_config(StopConfig(
                 position_id=position_id,
                 symbol=symbol,
                 side=side,
                 entry_price=entry_price,
                 take_profit_price=take_profit_price,
-            )
+            ))
         
         logger.info(f"设置止盈: {position_id}, 价格: {take_profit_price}")
     
-    async def set_trailing_stop(
+    def set_trailing_stop(
         self,
         position_id: str,
         symbol: str,
@@ -140,23 +161,20 @@ class StopManager:
         if position_id in self._configs:
             self._configs[position_id].trailing_stop_percent = trailing_percent
         else:
-            self._configs[position_id] = StopConfig(
+            self._add_config(StopConfig(
                 position_id=position_id,
                 symbol=symbol,
                 side=side,
                 entry_price=entry_price,
                 trailing_stop_percent=trailing_percent,
-            )
+            ))
         
         # 初始化最高/最低价
-        if side == "LONG":
-            self._highest_prices[position_id] = entry_price
-        else:
-            self._lowest_prices[position_id] = entry_price
+        self._configs[position_id].extreme_price = entry_price
         
         logger.info(f"设置追踪止损: {position_id}, 百分比: {trailing_percent:.2%}")
     
-    async def check_triggers(
+    def check_triggers(
         self,
         current_prices: dict[str, float],
     ) -> list[TriggerEvent]:
@@ -169,102 +187,88 @@ class StopManager:
         Returns:
             触发事件列表
         """
-        events: list[TriggerEvent] = []
+        # 命中项：(仓位 ID, 触发类型, 触发价, 当前价)，最后统一构建事件
+        hits: list[tuple[str, TriggerType, float, float]] = []
         
-        for position_id, config in self._configs.items():
-            current_price = current_prices.get(config.symbol)
-            if current_price is None:
+        for symbol, current_price in current_prices.items():
+            configs = self._by_symbol.get(symbol)
+            if not configs:
                 continue
             
-            # 更新最高/最低价
-            if config.side == "LONG":
-                if position_id in self._highest_prices:
-                    self._highest_prices[position_id] = max(
-                        self._highest_prices[position_id], current_price
-                    )
-            else:
-                if position_id in self._lowest_prices:
-                    self._lowest_prices[position_id] = min(
-                        self._lowest_prices[position_id], current_price
-                    )
-            
-            # 检查止损
-            if config.stop_loss_price:
-                if self._is_stop_loss_triggered(config, current_price):
-                    events.append(TriggerEvent(
-                        position_id=position_id,
-                        trigger_type=TriggerType.STOP_LOSS,
-                        trigger_price=config.stop_loss_price,
-                        current_price=current_price,
-                    ))
-            
-            # 检查止盈
-            if config.take_profit_price:
-                if self._is_take_profit_triggered(config, current_price):
-                    events.append(TriggerEvent(
-                        position_id=position_id,
-                        trigger_type=TriggerType.TAKE_PROFIT,
-                        trigger_price=config.take_profit_price,
-                        current_price=current_price,
-                    ))
-            
-            # 检查追踪止损
-            if config.trailing_stop_percent:
-                trailing_price = self._get_trailing_stop_price(config)
-                if trailing_price and self._is_trailing_triggered(config, current_price, trailing_price):
-                    events.append(TriggerEvent(
-                        position_id=position_id,
-                        trigger_type=TriggerType.TRAILING_STOP,
-                        trigger_price=trailing_price,
-                        current_price=current_price,
-                    ))
+            for position_id, config in configs.items():
+                # 更新最高/最低价
+                extreme = config.extreme_price
+                if extreme is not None:
+                    if config.side_sign > 0:
+                        if current_price > extreme:
+                            config.extreme_price = current_price
+                    elif current_price < extreme:
+                        config.extreme_price = current_price
+                
+                # 检查止损
+                if config.stop_loss_price:
+                    if self._is_stop_loss_triggered(config, current_price):
+                        hits.append((position_id, TriggerType.STOP_LOSS, config.stop_loss_price, current_price))
+                
+                # 检查止盈
+                if config.take_profit_price:
+                    if self._is_take_profit_triggered(config, current_price):
+                        hits.append((position_id, TriggerType.TAKE_PROFIT, config.take_profit_price, current_price))
+                
+                # 检查追踪止损
+                if config.trailing_stop_percent:
+                    trailing_price = self._get_trailing_stop_price(config)
+                    if trailing_price and self._is_trailing_triggered(config, current_price, trailing_price):
+                        hits.append((position_id, TriggerType.TRAILING_STOP, trailing_price, current_price))
         
-        return events
+        if not hits:
+            return []
+        
+        # 同一批事件共用一个时间戳
+        now_ns = time.time_ns()
+        return [
+            TriggerEvent(position_id, trigger_type, trigger_price, current_price, now_ns)
+            for position_id, trigger_type, trigger_price, current_price in hits
+        ]
     
     def remove_config(self, position_id: str) -> None:
         """移除配置"""
-        if position_id in self._configs:
-            del self._configs[position_id]
-        if position_id in self._highest_prices:
-            del self._highest_prices[position_id]
-        if position_id in self._lowest_prices:
-            del self._lowest_prices[position_id]
+        config = self._configs.pop(position_id, None)
+        if config is not None:
+            configs = self._by_symbol[config.symbol]
+            del configs[position_id]
+            if not configs:
+                del self._by_symbol[config.symbol]
+    
+    def _add_config(self, config: StopConfig) -> None:
+        """登记新配置"""
+        self._configs[config.position_id] = config
+        self._by_symbol.setdefault(config.symbol, {})[config.position_id] = config
     
     def _is_stop_loss_triggered(self, config: StopConfig, current_price: float) -> bool:
         """检查止损是否触发"""
         if config.stop_loss_price is None:
             return False
         
-        if config.side == "LONG":
-            return current_price <= config.stop_loss_price
-        else:
-            return current_price >= config.stop_loss_price
+        return (current_price - config.stop_loss_price) * config.side_sign <= 0
     
     def _is_take_profit_triggered(self, config: StopConfig, current_price: float) -> bool:
         """检查止盈是否触发"""
         if config.take_profit_price is None:
             return False
         
-        if config.side == "LONG":
-            return current_price >= config.take_profit_price
-        else:
-            return current_price <= config.take_profit_price
+        return (current_price - config.take_profit_price) * config.side_sign >= 0
     
     def _get_trailing_stop_price(self, config: StopConfig) -> float | None:
         """获取追踪止损价格"""
         if config.trailing_stop_percent is None:
             return None
         
-        if config.side == "LONG":
-            highest = self._highest_prices.get(config.position_id)
-            if highest:
-                return highest * (1 - config.trailing_stop_percent)
-        else:
-            lowest = self._lowest_prices.get(config.position_id)
-            if lowest:
-                return lowest * (1 + config.trailing_stop_percent)
+        extreme = config.extreme_price
+        if not extreme:
+            return None
         
-        return None
+        return extreme * (1 - config.trailing_stop_percent * config.side_sign)
     
     def _is_trailing_triggered(
         self,
@@ -273,7 +277,4 @@ class StopManager:
         trailing_price: float,
     ) -> bool:
         """检查追踪止损是否触发"""
-        if config.side == "LONG":
-            return current_price <= trailing_price
-        else:
-            return current_price >= trailing_price
+        return (current_price - trailing_price) * config.side_sign <= 0
@@ -6,7 +6,7 @@ BTC 自动交易系统 — 账户生存性风控
 
 from src.common.enums import RiskEventType, RiskLevel
 from src.common.logging import get_logger
-from src.common.models import RiskCheckResult, RiskEvent
+from src.common.models import RiskCheckResult
 
 from .base import RiskChecker, RiskContext
 from .constants import RiskThresholds
@@ -24,6 +24,12 @@ class AccountRiskChecker(RiskChecker):
     - 连续亏损次数
     - 周最大亏损
     """
+    __slots__ = (
+        "max_drawdown",
+        "daily_max_loss",
+        "weekly_max_loss",
+        "consecutive_loss_cooldown",
+    )
     
     @property
     def name(self) -> str:
@@ -45,58 +51,62 @@ class AccountRiskChecker(RiskChecker):
     
     async def check(self, context: RiskContext) -> RiskCheckResult:
         """执行账户风控检查"""
-        events: list[RiskEvent] = []
+        # 快速路径：账户明显健康时无需逐项比较
+        if (
+            context.drawdown < self.max_drawdown * 0.5
+            and context.daily_pnl >= 0
+            and context.weekly_pnl >= 0
+            and context.consecutive_losses == 0
+        ):
+            return self._approve()
         
         # 检查最大回撤
         if context.drawdown >= self.max_drawdown:
             event = self._create_event(
-                event_type=RiskEventType.DRAWDOWN_EXCEEDED.value,
+                event_type=RiskEventType.DRAWDOWN_EXCEEDED,
                 level=RiskLevel.RISK_LOCKED,
                 description=f"回撤 {context.drawdown:.2%} 超过阈值 {self.max_drawdown:.2%}",
                 value=context.drawdown,
                 threshold=self.max_drawdown,
             )
-            events.append(event)
             logger.warning(f"回撤超限: {context.drawdown:.2%}")
             return self._reject(
                 level=RiskLevel.RISK_LOCKED,
                 reason="回撤超过最大阈值",
-                events=events,
+                events=[event],
             )
         
         # 检查单日亏损
         daily_loss_ratio = context.daily_loss_ratio
         if daily_loss_ratio >= self.daily_max_loss:
             event = self._create_event(
-                event_type=RiskEventType.DAILY_LOSS_EXCEEDED.value,
+                event_type=RiskEventType.DAILY_LOSS_EXCEEDED,
                 level=RiskLevel.COOLDOWN,
                 description=f"单日亏损 {daily_loss_ratio:.2%} 超过阈值 {self.daily_max_loss:.2%}",
                 value=daily_loss_ratio,
                 threshold=self.daily_max_loss,
             )
-            events.append(event)
             logger.warning(f"单日亏损超限: {daily_loss_ratio:.2%}")
             return self._reject(
                 level=RiskLevel.COOLDOWN,
                 reason="单日亏损超过阈值",
-                events=events,
+                events=[event],
             )
         
         # 检查连续亏损
         if context.consecutive_losses >= self.consecutive_loss_cooldown:
             event = self._create_event(
-                event_type=RiskEventType.CONSECUTIVE_LOSS.value,
+                event_type=RiskEventType.CONSECUTIVE_LOSS,
                 level=RiskLevel.COOLDOWN,
                 description=f"连续亏损 {context.consecutive_losses} 次",
                 value=float(context.consecutive_losses),
                 threshold=float(self.consecutive_loss_cooldown),
             )
-            events.append(event)
             logger.warning(f"连续亏损: {context.consecutive_losses} 次")
             return self._reject(
                 level=RiskLevel.COOLDOWN,
                 reason="连续亏损次数过多",
-                events=events,
+                events=[event],
             )
         
         # 检查周亏损
@@ -104,17 +114,16 @@ class AccountRiskChecker(RiskChecker):
             weekly_loss_ratio = -context.weekly_pnl / context.equity if context.weekly_pnl < 0 else 0
             if weekly_loss_ratio >= self.weekly_max_loss:
                 event = self._create_event(
-                    event_type=RiskEventType.DAILY_LOSS_EXCEEDED.value,
+                    event_type=RiskEventType.DAILY_LOSS_EXCEEDED,
                     level=RiskLevel.COOLDOWN,
                     description=f"周亏损 {weekly_loss_ratio:.2%} 超过阈值 {self.weekly_max_loss:.2%}",
                     value=weekly_loss_ratio,
                     threshold=self.weekly_max_loss,
                 )
-                events.append(event)
                 return self._reject(
                     level=RiskLevel.COOLDOWN,
                     reason="周亏损超过阈值",
-                    events=events,
+                    events=[event],
                 )
         
         # 检查预警
@@ -4,21 +4,30 @@ BTC 自动交易系统 — 风控基类
 定义风控检查器接口和上下文模型。
 """
 
+import itertools
+import time
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
-from pydantic import BaseModel, Field
-
-from src.common.enums import RiskLevel
+from src.common.enums import RiskEventType, RiskLevel
 from src.common.models import RiskCheckResult, RiskEvent, WitnessHealth
 from src.common.utils import utc_now
 
+# 风控事件 ID：进程启动时刻前缀 + 进程内递增序号，避免每个事件生成 uuid4
+_EVENT_ID_PREFIX = f"{time.time_ns():x}-"
+_event_seq = itertools.count(1)
+
+# 批准结果不含调用相关数据，按级别共享实例（RiskCheckResult 为 frozen，其 timestamp 为缓存创建时间）
+_APPROVE_CACHE: dict[RiskLevel, RiskCheckResult] = {
+    level: RiskCheckResult(approved=True, level=level) for level in RiskLevel
+}
+
 
-class TradeRecord(BaseModel):
+@dataclass(frozen=True, slots=True)
+class TradeRecord:
     """交易记录"""
-    model_config = {"frozen": True}
-    
     trade_id: str
     strategy_id: str
     direction: str
@@ -26,56 +35,86 @@ class TradeRecord(BaseModel):
     entry_price: float
     exit_price: float | None = None
     pnl: float = 0.0
-    timestamp: datetime = Field(default_factory=utc_now)
+    timestamp: datetime = field(default_factory=utc_now)
 
 
-class RiskContext(BaseModel):
+@dataclass(frozen=True, slots=True)
+class RiskContext:
     """
     风控上下文
     
     包含风控检查所需的所有信息。
+    由系统内部构建，不做 pydantic 校验；字段约束只在 __debug__ 下检查。
     """
     # 账户状态
-    equity: float = Field(gt=0, description="账户权益")
-    initial_equity: float = Field(gt=0, description="初始权益")
-    drawdown: float = Field(ge=0, le=1, description="当前回撤")
-    daily_pnl: float = Field(description="当日盈亏")
-    weekly_pnl: float = Field(default=0.0, description="本周盈亏")
+    equity: float  # 账户权益，> 0
+    initial_equity: float  # 初始权益，> 0
+    drawdown: float  # 当前回撤，[0, 1]
+    daily_pnl: float  # 当日盈亏
+    weekly_pnl: float = 0.0  # 本周盈亏
     
     # 交易状态
-    consecutive_losses: int = Field(ge=0, default=0)
-    current_position: float = Field(ge=0, default=0)
-    recent_trades: list[TradeRecord] = Field(default_factory=list)
+    consecutive_losses: int = 0
+    current_position: float = 0.0
+    recent_trades: list[TradeRecord] = field(default_factory=list)
+    # 方向计数：维护滚动窗口的调用方可成对增量传入，均未传入时由 recent_trades 统计
+    long_count: int | None = None
+    short_count: int | None = None
     
     # 证人状态
-    witness_health: dict[str, WitnessHealth] = Field(default_factory=dict)
+    witness_health: dict[str, WitnessHealth] = field(default_factory=dict)
     
     # 执行状态
-    recent_slippages: list[float] = Field(default_factory=list)
-    recent_fill_rates: list[float] = Field(default_factory=list)
-    recent_latencies: list[int] = Field(default_factory=list)
+    recent_slippages: list[float] = field(default_factory=list)
+    recent_fill_rates: list[float] = field(default_factory=list)
+    recent_latencies: list[int] = field(default_factory=list)
     
     # 系统状态
-    data_delay_ms: int = Field(default=0)
+    data_delay_ms: int = 0
     last_heartbeat: datetime | None = None
     
     # 请求信息
-    requested_position: float = Field(default=0.0)
+    requested_position: float = 0.0
     requested_direction: str | None = None
     
-    @property
-    def drawdown_ratio(self) -> float:
-        """计算回撤比例"""
-        if self.initial_equity <= 0:
-            return 0.0
-        return (self.initial_equity - self.equity) / self.initial_equity
+    # 派生比例：构建时计算一次，检查器按普通属性读取
+    drawdown_ratio: float = field(init=False, default=0.0)
+    daily_loss_ratio: float = field(init=False, default=0.0)
     
-    @property
-    def daily_loss_ratio(self) -> float:
-        """计算当日亏损比例"""
+    def __post_init__(self) -> None:
+        # 补齐方向计数，检查器读取时为 O(1)；只传一个会与另一个不一致，必须成对传入
+        if self.long_count is None and self.short_count is None:
+            long_count = sum(1 for t in self.recent_trades if t.direction == "long")
+            object.__setattr__(self, "long_count", long_count)
+            object.__setattr__(self, "short_count", len(self.recent_trades) - long_count)
+        elif self.long_count is None or self.short_count is None:
+            raise ValueError("long_count 与 short_count 必须同时传入")
+        
+        if __debug__:
+            self._validate()
+        
+        if self.initial_equity > 0:
+            drawdown_ratio = (self.initial_equity - self.equity) / self.initial_equity
+            object.__setattr__(self, "drawdown_ratio", drawdown_ratio)
+        if self.equity > 0 and self.daily_pnl < 0:
+            object.__setattr__(self, "daily_loss_ratio", -self.daily_pnl / self.equity)
+    
+    def _validate(self) -> None:
+        """字段约束检查"""
         if self.equity <= 0:
-            return 0.0
-        return -self.daily_pnl / self.equity if self.daily_pnl < 0 else 0.0
+            raise ValueError(f"equity 必须大于 0: {self.equity}")
+        if self.initial_equity <= 0:
+            raise ValueError(f"initial_equity 必须大于 0: {self.initial_equity}")
+        if not 0 <= self.drawdown <= 1:
+            raise ValueError(f"drawdown 必须在 [0, 1] 内: {self.drawdown}")
+        if self.consecutive_losses < 0:
+            raise ValueError(f"consecutive_losses 不能为负: {self.consecutive_losses}")
+        if self.current_position < 0:
+            raise ValueError(f"current_position 不能为负: {self.current_position}")
+        if self.long_count < 0:
+            raise ValueError(f"long_count 不能为负: {self.long_count}")
+        if self.short_count < 0:
+            raise ValueError(f"short_count 不能为负: {self.short_count}")
 
 
 class RiskChecker(ABC):
@@ -84,6 +123,7 @@ class RiskChecker(ABC):
     
     所有风险域检查器必须继承此类。
     """
+    __slots__ = ()
     
     @property
     @abstractmethod
@@ -106,19 +146,16 @@ class RiskChecker(ABC):
     
     def _create_event(
         self,
-        event_type: str,
+        event_type: RiskEventType,
         level: RiskLevel,
         description: str,
         value: float | None = None,
         threshold: float | None = None,
     ) -> RiskEvent:
         """创建风控事件"""
-        from src.common.enums import RiskEventType
-        import uuid
-        
         return RiskEvent(
-            event_id=str(uuid.uuid4()),
-            event_type=RiskEventType(event_type),
+            event_id=f"{_EVENT_ID_PREFIX}{next(_event_seq)}",
+            event_type=event_type,
             level=level,
             description=description,
             value=value,
@@ -126,8 +163,8 @@ class RiskChecker(ABC):
         )
     
     def _approve(self, level: RiskLevel = RiskLevel.NORMAL) -> RiskCheckResult:
-        """返回批准结果"""
-        return RiskCheckResult(approved=True, level=level)
+        """返回批准结果（共享实例）"""
+        return _APPROVE_CACHE[level]
     
     def _reject(
         self,
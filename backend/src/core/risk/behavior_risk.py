@@ -23,6 +23,12 @@ class BehaviorRiskChecker(RiskChecker):
     - 持仓集中度
     - 方向性集中度
     """
+    __slots__ = (
+        "max_trades_per_hour",
+        "max_single_position",
+        "max_total_position",
+        "max_direction_ratio",
+    )
     
     @property
     def name(self) -> str:
@@ -42,29 +48,32 @@ class BehaviorRiskChecker(RiskChecker):
     
     async def check(self, context: RiskContext) -> RiskCheckResult:
         """执行行为风控检查"""
-        events: list[RiskEvent] = []
+        events: list[RiskEvent] | None = None
         
         # 检查交易频率
-        if len(context.recent_trades) > self.max_trades_per_hour:
+        trade_count = len(context.recent_trades)
+        if trade_count > self.max_trades_per_hour:
             event = self._create_event(
-                event_type=RiskEventType.EXECUTION_FAILURE.value,
+                event_type=RiskEventType.EXECUTION_FAILURE,
                 level=RiskLevel.WARNING,
-                description=f"交易频率 {len(context.recent_trades)}/h 超过阈值 {self.max_trades_per_hour}/h",
-                value=float(len(context.recent_trades)),
+                description=f"交易频率 {trade_count}/h 超过阈值 {self.max_trades_per_hour}/h",
+                value=float(trade_count),
                 threshold=float(self.max_trades_per_hour),
             )
-            events.append(event)
-            logger.warning(f"交易频率过高: {len(context.recent_trades)}/h")
+            events = [event]
+            logger.warning(f"交易频率过高: {trade_count}/h")
         
         # 检查单笔仓位
         if context.requested_position > self.max_single_position:
             event = self._create_event(
-                event_type=RiskEventType.EXECUTION_FAILURE.value,
+                event_type=RiskEventType.EXECUTION_FAILURE,
                 level=RiskLevel.WARNING,
                 description=f"请求仓位 {context.requested_position:.2%} 超过单笔上限 {self.max_single_position:.2%}",
                 value=context.requested_position,
                 threshold=self.max_single_position,
             )
+            if events is None:
+                events = []
             events.append(event)
             logger.warning(f"单笔仓位过大: {context.requested_position:.2%}")
             return self._reject(
@@ -77,12 +86,14 @@ class BehaviorRiskChecker(RiskChecker):
         total_position = context.current_position + context.requested_position
         if total_position > self.max_total_position:
             event = self._create_event(
-                event_type=RiskEventType.EXECUTION_FAILURE.value,
+                event_type=RiskEventType.EXECUTION_FAILURE,
                 level=RiskLevel.WARNING,
                 description=f"总仓位 {total_position:.2%} 超过上限 {self.max_total_position:.2%}",
                 value=total_position,
                 threshold=self.max_total_position,
             )
+            if events is None:
+                events = []
             events.append(event)
             logger.warning(f"总仓位过大: {total_position:.2%}")
             return self._reject(
@@ -92,24 +103,24 @@ class BehaviorRiskChecker(RiskChecker):
             )
         
         # 检查方向集中度
-        if context.recent_trades:
-            long_count = sum(1 for t in context.recent_trades if t.direction == "long")
-            short_count = len(context.recent_trades) - long_count
-            total = len(context.recent_trades)
-            
-            if total > 0:
-                direction_ratio = max(long_count, short_count) / total
-                if direction_ratio > self.max_direction_ratio:
-                    dominant = "long" if long_count > short_count else "short"
-                    event = self._create_event(
-                        event_type=RiskEventType.EXECUTION_FAILURE.value,
-                        level=RiskLevel.WARNING,
-                        description=f"方向集中度 {direction_ratio:.2%} ({dominant}) 过高",
-                        value=direction_ratio,
-                        threshold=self.max_direction_ratio,
-                    )
-                    events.append(event)
-                    logger.warning(f"方向集中度过高: {direction_ratio:.2%} ({dominant})")
+        long_count = context.long_count
+        short_count = context.short_count
+        total = long_count + short_count
+        if total > 0:
+            direction_ratio = max(long_count, short_count) / total
+            if direction_ratio > self.max_direction_ratio:
+                dominant = "long" if long_count > short_count else "short"
+                event = self._create_event(
+                    event_type=RiskEventType.EXECUTION_FAILURE,
+                    level=RiskLevel.WARNING,
+                    description=f"方向集中度 {direction_ratio:.2%} ({dominant}) 过高",
+                    value=direction_ratio,
+                    threshold=self.max_direction_ratio,
+                )
+                if events is None:
+                    events = []
+                events.append(event)
+                logger.warning(f"方向集中度过高: {direction_ratio:.2%} ({dominant})")
         
         if events:
             return RiskCheckResult(
@@ -4,13 +4,17 @@ BTC 自动交易系统 — 风控引擎
 聚合所有风险检查器，提供统一的风控接口。
 """
 
-from collections import defaultdict
+from bisect import bisect_left
+from collections import defaultdict, deque
+from collections.abc import Mapping
 from datetime import datetime
+from itertools import islice
+from types import MappingProxyType
 
 from src.common.enums import RiskLevel
 from src.common.logging import get_logger
 from src.common.models import RiskCheckResult, RiskEvent
-from src.common.utils import utc_now
+from src.common.utils import to_utc, utc_now
 
 from .account_risk import AccountRiskChecker
 from .base import RiskChecker, RiskContext
@@ -21,6 +25,14 @@ from .system_risk import SystemRiskChecker
 
 logger = get_logger(__name__)
 
+# 风险级别优先级（RiskLevel 的字符串值用于序列化，不改为 IntEnum）
+_LEVEL_PRIORITY: dict[RiskLevel, int] = {
+    RiskLevel.NORMAL: 0,
+    RiskLevel.WARNING: 1,
+    RiskLevel.COOLDOWN: 2,
+    RiskLevel.RISK_LOCKED: 3,
+}
+
 
 class WitnessCorrelationCalculator:
     """
@@ -35,10 +47,17 @@ class WitnessCorrelationCalculator:
     MAX_CORRELATED_WITNESSES = 2
     
     def __init__(self):
-        # 证人信号历史：{witness_id: [(timestamp, direction, result)]}
-        self._signal_history: dict[str, list[tuple[datetime, str, bool]]] = defaultdict(list)
-        # 缓存的相关性矩阵
+        # 证人信号历史：{witness_id: [(时间戳秒, direction, result)]}
+        # 记录时即转换为 epoch 秒，相关性计算只做浮点比较
+        # 每个证人只保留最近 200 条（环形缓冲）
+        self._signal_history: dict[str, deque[tuple[float, str, bool]]] = defaultdict(
+            lambda: deque(maxlen=200)
+        )
+        # 证人累计信号数，作为缓存版本号
+        self._signal_counts: dict[str, int] = defaultdict(int)
+        # 缓存的相关性矩阵，及计算时两个证人的信号数；信号数变化即视为失效
         self._correlation_matrix: dict[tuple[str, str], float] = {}
+        self._correlation_versions: dict[tuple[str, str], tuple[int, int]] = {}
         self._last_update: datetime | None = None
     
     def record_signal(
@@ -49,10 +68,8 @@ class WitnessCorrelationCalculator:
         result: bool,
     ) -> None:
         """记录证人信号结果"""
-        self._signal_history[witness_id].append((timestamp, direction, result))
-        # 保留最近 200 条记录
-        if len(self._signal_history[witness_id]) > 200:
-            self._signal_history[witness_id] = self._signal_history[witness_id][-200:]
+        self._signal_history[witness_id].append((to_utc(timestamp).timestamp(), direction, result))
+        self._signal_counts[witness_id] += 1
     
     def calculate_correlation(self, witness_a: str, witness_b: str) -> float:
         """
@@ -60,25 +77,57 @@ class WitnessCorrelationCalculator:
         
         基于信号方向和结果的一致性计算。
         """
-        history_a = self._signal_history.get(witness_a, [])
-        history_b = self._signal_history.get(witness_b, [])
-        
-        if len(history_a) < 20 or len(history_b) < 20:
+        window_a = self._recent_window(witness_a)
+        window_b = self._recent_window(witness_b)
+        if window_a is None or window_b is None:
             return 0.0  # 样本不足，返回无相关
         
-        # 找到时间重叠的信号
+        return self._window_correlation(window_a, window_b)
+    
+    def _recent_window(self, witness_id: str) -> list[tuple[float, str, bool]] | None:
+        """取证人最近 50 条信号（按时间升序），样本不足 20 条时返回 None"""
+        history = self._signal_history.get(witness_id)
+        if history is None or len(history) < 20:
+            return None
+        # 信号通常按时间顺序到达，排序对有序输入是线性的
+        return sorted(islice(history, max(len(history) - 50, 0), None))
+    
+    @staticmethod
+    def _window_correlation(
+        window_a: list[tuple[float, str, bool]],
+        window_b: list[tuple[float, str, bool]],
+    ) -> float:
+        """
+        计算两段信号窗口的相关性
+        
+        统计时间相差 1 小时内的信号对中，方向与结果都相同的比例。
+        两段窗口均按时间升序，用双指针维护 window_b 中与当前信号
+        相差 1 小时内的区间 [lo, hi)，区间内同类信号数由位置表二分得到。
+        """
+        ts_b = [ts for ts, _, _ in window_b]
+        # (方向, 结果) -> window_b 中的位置（升序）
+        positions: dict[tuple[str, bool], list[int]] = defaultdict(list)
+        for j, (_, dir_b, res_b) in enumerate(window_b):
+            positions[(dir_b, res_b)].append(j)
+        
+        n = len(ts_b)
+        lo = hi = 0
         matches = 0
         total = 0
         
-        # 简化：按时间窗口匹配（1小时内）
-        for ts_a, dir_a, res_a in history_a[-50:]:
-            for ts_b, dir_b, res_b in history_b[-50:]:
-                time_diff = abs((ts_a - ts_b).total_seconds())
-                if time_diff < 3600:  # 1小时内
-                    total += 1
-                    # 方向相同且结果相同
-                    if dir_a == dir_b and res_a == res_b:
-                        matches += 1
+        for ts_a, dir_a, res_a in window_a:
+            while lo < n and ts_b[lo] <= ts_a - 3600:
+                lo += 1
+            while hi < n and ts_b[hi] < ts_a + 3600:
+                hi += 1
+            if hi == lo:
+                continue
+            
+            total += hi - lo
+            # 方向相同且结果相同
+            same = positions.get((dir_a, res_a))
+            if same:
+                matches += bisect_left(same, hi) - bisect_left(same, lo)
         
         if total == 0:
             return 0.0
@@ -102,17 +151,27 @@ class WitnessCorrelationCalculator:
             return True, "", []
         
         high_correlated_pairs: list[tuple[str, str, float]] = []
+        # 每个证人的信号窗口只提取一次，供其参与的所有证人对复用
+        windows = {w: self._recent_window(w) for w in active_witnesses}
         
         # 计算所有证人对的相关性
+        counts = self._signal_counts
         for i, w_a in enumerate(active_witnesses):
+            window_a = windows[w_a]
             for w_b in active_witnesses[i + 1:]:
-                # 检查缓存
+                # 检查缓存（两个证人都没有新信号时有效）
                 cache_key = (min(w_a, w_b), max(w_a, w_b))
-                if cache_key in self._correlation_matrix:
+                version = (counts.get(cache_key[0], 0), counts.get(cache_key[1], 0))
+                if self._correlation_versions.get(cache_key) == version:
                     corr = self._correlation_matrix[cache_key]
                 else:
-                    corr = self.calculate_correlation(w_a, w_b)
+                    window_b = windows[w_b]
+                    if window_a is None or window_b is None:
+                        corr = 0.0
+                    else:
+                        corr = self._window_correlation(window_a, window_b)
                     self._correlation_matrix[cache_key] = corr
+                    self._correlation_versions[cache_key] = version
                 
                 if corr >= self.HIGH_CORRELATION_THRESHOLD:
                     high_correlated_pairs.append((w_a, w_b, corr))
@@ -133,14 +192,20 @@ class WitnessCorrelationCalculator:
         
         return True, "", high_correlated_pairs
     
-    def get_correlation_matrix(self) -> dict[tuple[str, str], float]:
-        """获取相关性矩阵"""
-        return self._correlation_matrix.copy()
+    def get_correlation_matrix(self) -> Mapping[tuple[str, str], float]:
+        """
+        获取相关性矩阵
+        
+        返回只读视图而非副本，内容随后续计算更新；需要快照时由调用方 dict() 复制。
+        """
+        return MappingProxyType(self._correlation_matrix)
     
     def clear_history(self) -> None:
         """清除历史数据"""
         self._signal_history.clear()
+        self._signal_counts.clear()
         self._correlation_matrix.clear()
+        self._correlation_versions.clear()
 
 
 class RiskControlEngine:
@@ -151,12 +216,15 @@ class RiskControlEngine:
     风控拥有硬否决权，任何检查器拒绝即拒绝。
     """
     
+    # 内存中保留的风控事件上限，超出后淘汰最旧的
+    MAX_EVENT_HISTORY = 10_000
+    
     def __init__(self):
         self._checkers: list[RiskChecker] = []
         self._current_level = RiskLevel.NORMAL
         self._lock_reason: str | None = None
         self._lock_time: datetime | None = None
-        self._all_events: list[RiskEvent] = []
+        self._all_events: deque[RiskEvent] = deque(maxlen=self.MAX_EVENT_HISTORY)
         
         # 证人相关性计算器
         self._correlation_calculator = WitnessCorrelationCalculator()
@@ -231,13 +299,15 @@ class RiskControlEngine:
                 all_events.extend(result.events)
                 
                 # 更新最高风险级别
-                if self._level_priority(result.level) > self._level_priority(highest_level):
+                if _LEVEL_PRIORITY[result.level] > _LEVEL_PRIORITY[highest_level]:
                     highest_level = result.level
                 
                 # 任何检查器拒绝即拒绝（硬否决权）
                 if not result.approved:
                     logger.warning(
-                        f"风控拒绝 [{checker.name}]: {result.reason}",
+                        "风控拒绝 [%s]: %s",
+                        checker.name,
+                        result.reason,
                         extra={"level": result.level.value},
                     )
                     
@@ -255,7 +325,7 @@ class RiskControlEngine:
                     )
                     
             except Exception as e:
-                logger.error(f"风控检查器异常 [{checker.name}]: {e}")
+                logger.error("风控检查器异常 [%s]: %s", checker.name, e)
                 # 检查器异常时保守处理，拒绝交易
                 return RiskCheckResult(
                     approved=False,
@@ -283,7 +353,7 @@ class RiskControlEngine:
         self._current_level = RiskLevel.RISK_LOCKED
         self._lock_reason = reason
         self._lock_time = utc_now()
-        logger.warning(f"系统强制锁定: {reason}")
+        logger.warning("系统强制锁定: %s", reason)
     
     async def force_cooldown(self, reason: str) -> None:
         """
@@ -294,7 +364,7 @@ class RiskControlEngine:
         """
         if not self.is_locked:
             self._current_level = RiskLevel.COOLDOWN
-            logger.warning(f"系统进入冷却期: {reason}")
+            logger.warning("系统进入冷却期: %s", reason)
     
     async def request_unlock(self) -> bool:
         """
@@ -316,13 +386,7 @@ class RiskControlEngine:
     
     def _level_priority(self, level: RiskLevel) -> int:
         """获取风险级别优先级"""
-        priorities = {
-            RiskLevel.NORMAL: 0,
-            RiskLevel.WARNING: 1,
-            RiskLevel.COOLDOWN: 2,
-            RiskLevel.RISK_LOCKED: 3,
-        }
-        return priorities.get(level, 0)
+        return _LEVEL_PRIORITY.get(level, 0)
     
     # ========================================
     # 证人相关性检查
@@ -381,6 +445,6 @@ class RiskControlEngine:
         """获取两个证人之间的相关性"""
         return self._correlation_calculator.calculate_correlation(witness_a, witness_b)
     
-    def get_correlation_matrix(self) -> dict[tuple[str, str], float]:
-        """获取完整的相关性矩阵"""
+    def get_correlation_matrix(self) -> Mapping[tuple[str, str], float]:
+        """获取完整的相关性矩阵（只读视图）"""
         return self._correlation_calculator.get_correlation_matrix()
@@ -16,6 +16,9 @@ from .engine import RiskControlEngine
 
 logger = get_logger(__name__)
 
+# 降级模式最短持续时间
+_DEGRADED_MIN_DURATION = timedelta(hours=24)
+
 
 class RecoveryManager:
     """
@@ -35,6 +38,7 @@ class RecoveryManager:
         self.degraded_position_ratio = (
             degraded_position_ratio or RiskThresholds.recovery.degraded_position_ratio
         )
+        self._unlock_delta = timedelta(hours=self.auto_unlock_hours)
         self._degraded_mode = False
         self._recovery_start: datetime | None = None
     
@@ -65,8 +69,8 @@ class RecoveryManager:
         
         # 检查锁定时间
         elapsed = utc_now() - self.engine._lock_time
-        if elapsed < timedelta(hours=self.auto_unlock_hours):
-            remaining = timedelta(hours=self.auto_unlock_hours) - elapsed
+        if elapsed < self._unlock_delta:
+            remaining = self._unlock_delta - elapsed
             logger.info(f"自动解锁剩余时间: {remaining}")
             return False
         
@@ -148,7 +152,7 @@ class RecoveryManager:
         
         # 降级模式至少持续 24 小时
         elapsed = utc_now() - self._recovery_start
-        if elapsed < timedelta(hours=24):
+        if elapsed < _DEGRADED_MIN_DURATION:
             return False
         
         # 检查风险指标是否恢复正常
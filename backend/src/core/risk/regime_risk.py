@@ -48,72 +48,73 @@ class RegimeRiskChecker(RiskChecker):
         if not context.witness_health:
             return self._approve()
         
-        # 统计活跃证人
-        active_witnesses = [
-            w for w in context.witness_health.values()
-            if w.status == WitnessStatus.ACTIVE
-        ]
-        
-        # 检查活跃证人数量
-        if len(active_witnesses) < self.min_active_witnesses:
-            event = self._create_event(
-                event_type=RiskEventType.EXECUTION_FAILURE.value,
-                level=RiskLevel.WARNING,
-                description=f"活跃证人数量 {len(active_witnesses)} 低于最小要求 {self.min_active_witnesses}",
-                value=float(len(active_witnesses)),
-                threshold=float(self.min_active_witnesses),
-            )
-            events.append(event)
-            logger.warning(f"活跃证人不足: {len(active_witnesses)}")
-        
-        # 检查单个证人健康度
-        unhealthy_witnesses = []
+        # 单次遍历：统计活跃证人及其加权胜率，同时检查单个证人健康度
+        active_count = 0
+        total_weight = 0.0
+        weighted_win_rate = 0.0
+        unhealthy_witnesses: list[str] = []
+        low_win_rate_events: list[RiskEvent] = []
         for witness in context.witness_health.values():
+            if witness.status == WitnessStatus.ACTIVE:
+                active_count += 1
+                total_weight += witness.weight
+                weighted_win_rate += witness.win_rate * witness.weight
+            
             if witness.grade == HealthGrade.D:
                 unhealthy_witnesses.append(witness.witness_id)
             
             if witness.win_rate < self.min_witness_win_rate:
                 event = self._create_event(
-                    event_type=RiskEventType.EXECUTION_FAILURE.value,
+                    event_type=RiskEventType.EXECUTION_FAILURE,
                     level=RiskLevel.WARNING,
                     description=f"证人 {witness.witness_id} 胜率 {witness.win_rate:.2%} 过低",
                     value=witness.win_rate,
                     threshold=self.min_witness_win_rate,
                 )
-                events.append(event)
+                low_win_rate_events.append(event)
         
+        # 检查活跃证人数量
+        if active_count < self.min_active_witnesses:
+            event = self._create_event(
+                event_type=RiskEventType.EXECUTION_FAILURE,
+                level=RiskLevel.WARNING,
+                description=f"活跃证人数量 {active_count} 低于最小要求 {self.min_active_witnesses}",
+                value=float(active_count),
+                threshold=float(self.min_active_witnesses),
+            )
+            events.append(event)
+            logger.warning("活跃证人不足: %d", active_count)
+        
+        # 单个证人健康度
+        events.extend(low_win_rate_events)
         if unhealthy_witnesses:
-            logger.warning(f"不健康证人: {unhealthy_witnesses}")
+            logger.warning("不健康证人: %s", unhealthy_witnesses)
         
         # 计算组合胜率
-        if active_witnesses:
-            total_weight = sum(w.weight for w in active_witnesses)
-            if total_weight > 0:
-                combo_win_rate = sum(
-                    w.win_rate * w.weight for w in active_witnesses
-                ) / total_weight
-                
-                if combo_win_rate < self.min_combo_win_rate:
-                    event = self._create_event(
-                        event_type=RiskEventType.EXECUTION_FAILURE.value,
-                        level=RiskLevel.WARNING,
-                        description=f"组合胜率 {combo_win_rate:.2%} 低于阈值 {self.min_combo_win_rate:.2%}",
-                        value=combo_win_rate,
-                        threshold=self.min_combo_win_rate,
-                    )
-                    events.append(event)
-                    logger.warning(f"组合胜率过低: {combo_win_rate:.2%}")
-                
-                # 胜率异常高也是风险信号（可能过拟合）
-                if combo_win_rate > self.max_combo_win_rate:
-                    event = self._create_event(
-                        event_type=RiskEventType.EXECUTION_FAILURE.value,
-                        level=RiskLevel.WARNING,
-                        description=f"组合胜率 {combo_win_rate:.2%} 异常高，可能过拟合",
-                        value=combo_win_rate,
-                        threshold=self.max_combo_win_rate,
-                    )
-                    events.append(event)
+        if total_weight > 0:
+            combo_win_rate = weighted_win_rate / total_weight
+            
+            if combo_win_rate < self.min_combo_win_rate:
+                event = self._create_event(
+                    event_type=RiskEventType.EXECUTION_FAILURE,
+                    level=RiskLevel.WARNING,
+                    description=f"组合胜率 {combo_win_rate:.2%} 低于阈值 {self.min_combo_win_rate:.2%}",
+                    value=combo_win_rate,
+                    threshold=self.min_combo_win_rate,
+                )
+                events.append(event)
+                logger.warning("组合胜率过低: %.2f%%", combo_win_rate * 100)
+            
+            # 胜率异常高也是风险信号（可能过拟合）
+            if combo_win_rate > self.max_combo_win_rate:
+                event = self._create_event(
+                    event_type=RiskEventType.EXECUTION_FAILURE,
+                    level=RiskLevel.WARNING,
+                    description=f"组合胜率 {combo_win_rate:.2%} 异常高，可能过拟合",
+                    value=combo_win_rate,
+                    threshold=self.max_combo_win_rate,
+                )
+                events.append(event)
         
         if events:
             return RiskCheckResult(
@@ -45,14 +45,14 @@ class SystemRiskChecker(RiskChecker):
         # 检查数据延迟
         if context.data_delay_ms > self.max_data_delay_ms:
             event = self._create_event(
-                event_type=RiskEventType.EXECUTION_FAILURE.value,
+                event_type=RiskEventType.EXECUTION_FAILURE,
                 level=RiskLevel.WARNING,
                 description=f"数据延迟 {context.data_delay_ms}ms 超过阈值 {self.max_data_delay_ms}ms",
                 value=float(context.data_delay_ms),
                 threshold=float(self.max_data_delay_ms),
             )
             events.append(event)
-            logger.warning(f"数据延迟过高: {context.data_delay_ms}ms")
+            logger.warning("数据延迟过高: %sms", context.data_delay_ms)
             
             # 延迟严重时拒绝交易
             if context.data_delay_ms > self.max_data_delay_ms * 2:
@@ -67,14 +67,14 @@ class SystemRiskChecker(RiskChecker):
             gap = utc_now() - context.last_heartbeat
             if gap > timedelta(seconds=self.max_heartbeat_gap_seconds):
                 event = self._create_event(
-                    event_type=RiskEventType.EXECUTION_FAILURE.value,
+                    event_type=RiskEventType.EXECUTION_FAILURE,
                     level=RiskLevel.WARNING,
                     description=f"心跳间隔 {gap.total_seconds():.0f}s 超过阈值 {self.max_heartbeat_gap_seconds}s",
                     value=gap.total_seconds(),
                     threshold=float(self.max_heartbeat_gap_seconds),
                 )
                 events.append(event)
-                logger.warning(f"心跳间隔过长: {gap.total_seconds():.0f}s")
+                logger.warning("心跳间隔过长: %.0fs", gap.total_seconds())
                 
                 # 心跳丢失严重时拒绝
                 if gap > timedelta(seconds=self.max_heartbeat_gap_seconds * 3):
@@ -12,6 +12,7 @@ from .service import StateMachineService as StateService  # 别名
 from .states import (
     FORBIDDEN_TRANSITIONS,
     STATE_METADATA,
+    TRADING_ALLOWED_STATES,
     VALID_TRANSITIONS,
     StateMetadata,
     get_state_metadata,
@@ -24,6 +25,7 @@ __all__ = [
     # States
     "StateMetadata",
     "STATE_METADATA",
+    "TRADING_ALLOWED_STATES",
     "VALID_TRANSITIONS",
     "FORBIDDEN_TRANSITIONS",
     "get_state_metadata",
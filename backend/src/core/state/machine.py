@@ -13,7 +13,7 @@ from src.common.exceptions import InvalidStateTransitionError, StateNotEligibleE
 from src.common.logging import get_logger
 from src.common.utils import utc_now
 
-from .states import get_state_metadata, is_valid_transition
+from .states import TRADING_ALLOWED_STATES, get_state_metadata, is_valid_transition
 from .transitions import StateTransition, TransitionResult
 
 logger = get_logger(__name__)
@@ -45,8 +45,7 @@ class StateMachine:
     @property
     def is_trading_allowed(self) -> bool:
         """是否允许交易"""
-        metadata = get_state_metadata(self._state)
-        return metadata.allows_trading
+        return self._state in TRADING_ALLOWED_STATES
     
     @property
     def is_locked(self) -> bool:
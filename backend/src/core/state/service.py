@@ -15,6 +15,7 @@ from src.core.risk.engine import RiskControlEngine
 from .claim_processor import ClaimProcessor, ProcessResult
 from .machine import StateMachine
 from .regime import RegimeManager, RegimeOutput, TradeRegime
+from .states import TRADING_ALLOWED_STATES
 from .storage import StateStorage
 from .transitions import TransitionRecord
 
@@ -54,6 +55,10 @@ class StateMachineService:
         """是否允许交易"""
         return self.state_machine.is_trading_allowed
     
+    def get_allowed_trading_states(self) -> frozenset[SystemState]:
+        """获取允许交易的状态集合"""
+        return TRADING_ALLOWED_STATES
+    
     def is_locked(self) -> bool:
         """是否被锁定"""
         return self.state_machine.is_locked
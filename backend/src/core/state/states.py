@@ -72,6 +72,12 @@ STATE_METADATA: dict[SystemState, StateMetadata] = {
 }
 
 
+# 允许交易的状态集合（由元数据派生）
+TRADING_ALLOWED_STATES: frozenset[SystemState] = frozenset(
+    state for state, meta in STATE_METADATA.items() if meta.allows_trading
+)
+
+
 # 合法状态转换规则
 VALID_TRANSITIONS: dict[SystemState, set[SystemState]] = {
     SystemState.SYSTEM_INIT: {SystemState.OBSERVING, SystemState.RISK_LOCKED},
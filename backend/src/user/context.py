@@ -21,7 +21,7 @@ from .models import User, UserExchangeConfig, UserRiskState
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class TradingSignal:
     """交易信号"""
     signal_id: str
@@ -63,13 +63,13 @@ class TestLearningFlow:
     """学习流程集成测试"""
     
     @pytest.fixture
-    def setup(self):
+    def setup(self, tmp_path):
         """设置测试环境"""
         collector = LearningDataCollector()
         analyzer = PostTradeAnalyzer()
         statistics = StatisticsAnalyzer()
         engine = LearningEngine(collector, analyzer, statistics)
-        storage = LearningParamStorage(storage_path="data/test_params.json")
+        storage = LearningParamStorage(storage_path=str(tmp_path / "test_params.json"))
         return collector, engine, storage
     
     @pytest.mark.asyncio
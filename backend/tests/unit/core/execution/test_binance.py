@@ -0,0 +1,374 @@
+"""Binance 客户端测试"""
+
+import asyncio
+import hashlib
+import hmac
+from urllib.parse import urlencode
+
+import pytest
+
+from src.common.enums import OrderStatus
+from src.core.execution.exchange.binance import BinanceClient
+
+
+@pytest.fixture
+def client():
+    return BinanceClient(api_key="key", api_secret="secret")
+
+
+def fake_request(responses: dict[str, object], calls: list[tuple[str, str]]):
+    """按 endpoint 返回固定响应的 _request 替身"""
+    async def _request(method, endpoint, params=None, signed=False, dedupe_tag=0):
+        calls.append((method, endpoint))
+        return responses[endpoint]
+    return _request
+
+
+class TestBinanceBatch:
+    """批量查询测试"""
+    
+    @pytest.mark.asyncio
+    async def test_get_positions_batch(self, client):
+        """一次请求获取多个交易对仓位"""
+        calls: list[tuple[str, str]] = []
+        client._request = fake_request({
+            "/fapi/v2/positionRisk": [
+                {"symbol": "BTCUSDT", "positionAmt": "0.5", "entryPrice": "50000"},
+                {"symbol": "ETHUSDT", "positionAmt": "-2", "entryPrice": "3000"},
+                {"symbol": "BNBUSDT", "positionAmt": "1", "entryPrice": "500"},
+            ],
+        }, calls)
+        
+        positions = await client.get_positions_batch(["BTCUSDT", "ETHUSDT", "SOLUSDT"])
+        
+        assert len(calls) == 1
+        assert positions["BTCUSDT"].side == "LONG"
+        assert positions["ETHUSDT"].side == "SHORT"
+        assert positions["ETHUSDT"].quantity == 2
+        assert positions["SOLUSDT"].side == "NONE"
+        assert "BNBUSDT" not in positions
+    
+    @pytest.mark.asyncio
+    async def test_get_position_reuses_snapshot(self, client):
+        """快照有效期内查询不同交易对只请求一次"""
+        calls: list[tuple[str, str]] = []
+        client._request = fake_request({
+            "/fapi/v2/positionRisk": [
+                {"symbol": "BTCUSDT", "positionAmt": "0.5", "entryPrice": "50000"},
+                {"symbol": "ETHUSDT", "positionAmt": "-2", "entryPrice": "3000"},
+            ],
+        }, calls)
+        
+        assert (await client.get_position("BTCUSDT")).side == "LONG"
+        assert (await client.get_position("ETHUSDT")).side == "SHORT"
+        assert len(calls) == 1
+        
+        await client._handle_account_update({})
+        await client.get_position("BTCUSDT")
+        assert len(calls) == 2
+    
+    @pytest.mark.asyncio
+    async def test_stale_positions_fetch_not_reused(self, client):
+        """失效前发起的 positionRisk 查询既不被合并也不写入快照"""
+        stale_sent = asyncio.Event()
+        release_stale = asyncio.Event()
+        urls: list[str] = []
+        
+        class _Response:
+            def __init__(self, content):
+                self.content = content
+            
+            def raise_for_status(self):
+                pass
+        
+        class _Client:
+            async def request(self, method, url, params=None, headers=None):
+                urls.append(url)
+                if len(urls) == 1:
+                    stale_sent.set()
+                    await release_stale.wait()
+                    return _Response(b'[{"symbol": "BTCUSDT", "positionAmt": "0", "entryPrice": "0"}]')
+                return _Response(b'[{"symbol": "BTCUSDT", "positionAmt": "0.5", "entryPrice": "50000"}]')
+        
+        client._client = _Client()
+        stale = asyncio.create_task(client.get_position("BTCUSDT"))
+        await stale_sent.wait()
+        
+        # 下单成交后仓位变化
+        client._invalidate_positions_snapshot()
+        # 若合并到旧请求上会一直等待旧请求返回
+        fresh = await asyncio.wait_for(client.get_position("BTCUSDT"), timeout=1)
+        
+        release_stale.set()
+        await stale
+        
+        assert len(urls) == 2
+        assert fresh.side == "LONG"
+        assert (await client.get_position("BTCUSDT")).side == "LONG"
+        assert len(urls) == 2
+    
+    @pytest.mark.asyncio
+    async def test_get_ticker_prices_batch(self, client):
+        """一次请求获取多个交易对价格"""
+        calls: list[tuple[str, str]] = []
+        client._request = fake_request({
+            "/fapi/v1/ticker/price": [
+                {"symbol": "BTCUSDT", "price": "50000.5"},
+                {"symbol": "ETHUSDT", "price": "3000.1"},
+            ],
+        }, calls)
+        
+        prices = await client.get_ticker_prices_batch(["BTCUSDT", "ETHUSDT"])
+        
+        assert len(calls) == 1
+        assert prices == {"BTCUSDT": 50000.5, "ETHUSDT": 3000.1}
+        assert client.get_cached_price("BTCUSDT") == 50000.5
+    
+    @pytest.mark.asyncio
+    async def test_get_orders_status(self, client):
+        """挂单状态一次获取，已离开挂单列表的订单逐笔查询"""
+        calls: list[tuple[str, str]] = []
+        client._request = fake_request({
+            "/fapi/v1/openOrders": [{"clientOrderId": "o1", "status": "NEW"}],
+            "/fapi/v1/order": {"status": "FILLED"},
+        }, calls)
+        
+        statuses = await client.get_orders_status(["o1", "o2"], "BTCUSDT")
+        
+        assert statuses == [OrderStatus.SUBMITTED, OrderStatus.FILLED]
+        assert calls == [("GET", "/fapi/v1/openOrders"), ("GET", "/fapi/v1/order")]
+
+
+class TestBinanceSign:
+    """签名测试"""
+    
+    def test_sign_matches_hmac_sha256(self, client):
+        """签名与标准 HMAC-SHA256 一致，且模板可重复使用"""
+        query_string = "symbol=BTCUSDT&side=BUY&timestamp=1700000000000"
+        expected = hmac.new(b"secret", query_string.encode(), hashlib.sha256).hexdigest()
+        
+        assert client._sign(query_string) == expected
+        assert client._sign(query_string) == expected
+    
+    @pytest.mark.parametrize("params", [
+        {"symbol": "BTCUSDT", "side": "BUY", "quantity": "0.001", "timestamp": 1700000000000},
+        {"symbol": "BTCUSDT", "origClientOrderIdList": '["a","b"]'},
+        {"newClientOrderId": "user 1/order~x"},
+    ])
+    def test_encode_query_matches_urlencode(self, client, params):
+        """快速编码与 urlencode 结果一致"""
+        assert client._encode_query(params) == urlencode(params)
+    
+    @pytest.mark.asyncio
+    async def test_signed_request_sends_signed_query(self, client):
+        """签名请求发送的查询字符串与签名内容一致"""
+        sent: dict[str, object] = {}
+        
+        class _Response:
+            def raise_for_status(self):
+                pass
+            
+            content = b"{}"
+        
+        class _Client:
+            async def request(self, method, url, params=None, headers=None):
+                sent["method"] = method
+                sent["url"] = url
+                sent["params"] = params
+                sent["headers"] = headers
+                return _Response()
+        
+        client._client = _Client()
+        await client._request("POST", "/fapi/v1/order", {"symbol": "BTCUSDT"}, signed=True)
+        
+        base, query = str(sent["url"]).split("?", 1)
+        query_string, signature = query.rsplit("&signature=", 1)
+        assert base == f"{client.BASE_URL}/fapi/v1/order"
+        assert query_string.startswith("symbol=BTCUSDT&timestamp=")
+        assert signature == client._sign(query_string)
+        assert sent["method"] == "POST"
+        assert sent["params"] is None
+        assert sent["headers"]["X-MBX-APIKEY"] == "key"
+
+
+class TestBinanceMarketData:
+    """市场数据测试"""
+    
+    @pytest.mark.asyncio
+    async def test_get_klines(self, client):
+        """K 线解析"""
+        calls: list[tuple[str, str]] = []
+        client._request = fake_request({
+            "/fapi/v1/klines": [
+                [1700000000000, "50000", "50100", "49900", "50050", "12.5",
+                 1700003599999, "625000", 321, "6", "300000", "0"],
+            ],
+        }, calls)
+        
+        bars = await client.get_klines("BTCUSDT", interval="1h", limit=1)
+        
+        assert len(bars) == 1
+        bar = bars[0]
+        assert bar.ts == 1700000000000
+        assert bar.interval == "1h"
+        assert bar.close == 50050.0
+        assert bar.quote_volume == 625000.0
+        assert bar.trades == 321
+    
+    @pytest.mark.asyncio
+    async def test_idempotent_gets_are_cached(self, client):
+        """幂等 GET 在 TTL 内复用结果"""
+        calls: list[tuple[str, str]] = []
+        client._request = fake_request({
+            "/fapi/v1/ticker/price": {"symbol": "BTCUSDT", "price": "50000"},
+            "/fapi/v1/premiumIndex": {"symbol": "BTCUSDT", "lastFundingRate": "0.0001"},
+            "/fapi/v1/exchangeInfo": {"symbols": [{"symbol": "BTCUSDT"}]},
+        }, calls)
+        
+        for _ in range(3):
+            assert await client.get_ticker_price("BTCUSDT") == 50000.0
+            assert await client.get_funding_rate("BTCUSDT") == 0.0001
+            assert await client.get_exchange_info("BTCUSDT") == {"symbol": "BTCUSDT"}
+        
+        assert len(calls) == 3
+        assert client.cache_hit_ratio == pytest.approx(6 / 9)
+    
+    @pytest.mark.asyncio
+    async def test_cached_exchange_info_not_shared(self, client):
+        """修改返回的交易规则不影响缓存"""
+        calls: list[tuple[str, str]] = []
+        client._request = fake_request({
+            "/fapi/v1/exchangeInfo": {"symbols": [{"symbol": "BTCUSDT", "filters": []}]},
+        }, calls)
+        
+        info = await client.get_exchange_info()
+        info["symbols"][0]["filters"].append({"filterType": "PRICE_FILTER"})
+        symbol_info = await client.get_exchange_info("BTCUSDT")
+        symbol_info["symbol"] = "ETHUSDT"
+        
+        assert await client.get_exchange_info("BTCUSDT") == {"symbol": "BTCUSDT", "filters": []}
+        assert len(calls) == 1
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_gets_are_deduplicated(self, client):
+        """并发的相同 GET 只发送一次请求"""
+        urls: list[str] = []
+        
+        class _Response:
+            def raise_for_status(self):
+                pass
+            
+            content = b'{"symbol": "BTCUSDT", "price": "50000"}'
+        
+        class _Client:
+            async def request(self, method, url, params=None, headers=None):
+                urls.append(url)
+                await asyncio.sleep(0)
+                return _Response()
+        
+        client._client = _Client()
+        prices = await asyncio.gather(*(client.get_ticker_price("BTCUSDT") for _ in range(5)))
+        
+        assert prices == [50000.0] * 5
+        assert len(urls) == 1
+        assert client._inflight == {}
+
+
+class TestBinanceWebSocket:
+    """WebSocket 消息分发测试"""
+    
+    @pytest.mark.asyncio
+    async def test_dispatch_callbacks(self, client):
+        """内置处理与同步/异步回调均被触发"""
+        received: list[str] = []
+        
+        async def on_trade_async(data):
+            received.append("async")
+        
+        def on_trade_broken(data):
+            raise RuntimeError("订阅者异常")
+        
+        client.on_ws_event("trade", lambda data: received.append("sync"))
+        client.on_ws_event("trade", on_trade_broken)
+        client.on_ws_event("trade", on_trade_async)
+        
+        await client._handle_ws_message({"e": "trade", "s": "BTCUSDT", "p": "50000"})
+        await client._handle_ws_message({"e": "unknown"})
+        await asyncio.sleep(0)  # 同步回调经 call_soon 排队执行
+        
+        assert sorted(received) == ["async", "sync"]
+        assert client.get_cached_price("BTCUSDT") == 50000.0
+    
+    @pytest.mark.asyncio
+    async def test_ticker_updated_in_place(self, client):
+        """价格缓存按交易对原地更新"""
+        await client._handle_ws_message({"e": "trade", "s": "BTCUSDT", "p": "50000"})
+        ticker = client._ticker_cache["BTCUSDT"]
+        
+        await client._handle_ws_message({"e": "kline", "k": {"s": "BTCUSDT", "i": "1m", "c": "50100"}})
+        
+        assert client._ticker_cache["BTCUSDT"] is ticker
+        assert client.get_cached_price("BTCUSDT") == 50100.0
+    
+    @pytest.mark.asyncio
+    async def test_reconnect_after_error(self, client):
+        """接收异常后退避重连并继续处理消息，重连期间不报告为已连接"""
+        connected_states: list[bool] = []
+        
+        class _Socket:
+            def __init__(self, messages, error=None):
+                self._messages = messages
+                self._error = error
+            
+            def __aiter__(self):
+                return self._iter()
+            
+            async def _iter(self):
+                connected_states.append(client.is_ws_connected)
+                for message in self._messages:
+                    yield message
+                if self._error:
+                    raise self._error
+                client._ws_running = False
+            
+            async def close(self):
+                pass
+        
+        sockets = [_Socket(['{"e": "trade", "s": "BTCUSDT", "p": "51000"}'])]
+        
+        async def ws_open():
+            connected_states.append(client.is_ws_connected)
+            return sockets.pop(0)
+        
+        client._ws_open = ws_open
+        client._ws_reconnect_delay = 0
+        client._ws = _Socket([], error=OSError("connection reset"))
+        client._ws_connected = True
+        client._ws_running = True
+        
+        await asyncio.wait_for(client._ws_message_loop(), timeout=1)
+        
+        assert sockets == []
+        assert client.get_cached_price("BTCUSDT") == 51000.0
+        assert connected_states == [True, False, True]
+        assert not client.is_ws_connected
+
+
+class TestBinanceUserStream:
+    """用户数据流测试"""
+    
+    @pytest.mark.asyncio
+    async def test_ensure_user_stream_reuses_key(self, client):
+        """listenKey 复用并在断开时关闭"""
+        calls: list[tuple[str, str]] = []
+        client._request = fake_request({"/fapi/v1/listenKey": {"listenKey": "abc"}}, calls)
+        client._client = object()
+        
+        assert await client.ensure_user_stream() == "abc"
+        assert await client.ensure_user_stream() == "abc"
+        assert calls == [("POST", "/fapi/v1/listenKey")]
+        
+        await client._stop_user_stream()
+        
+        assert calls[-1] == ("DELETE", "/fapi/v1/listenKey")
+        assert client._listen_key_task is None
@@ -110,3 +110,52 @@ class TestExecutionEngine:
         
         await engine.unfreeze()
         assert not engine.is_frozen
+    
+    def test_high_window_multiplier_copies_order(self, exchange, state_service, test_order):
+        """高交易窗口放大系数只作用于副本"""
+        engine = ExecutionEngine(exchange, state_service)
+        engine.set_high_trading_window(True, confidence=0.8)
+        
+        adjusted = engine._apply_high_window_multiplier(test_order)
+        
+        assert adjusted is not test_order
+        assert adjusted.quantity == pytest.approx(test_order.quantity * engine.HIGH_WINDOW_MULTIPLIER)
+        assert adjusted.order_id == test_order.order_id
+        assert adjusted.timestamp == test_order.timestamp
+        assert test_order.quantity == 0.1
+    
+    @pytest.mark.asyncio
+    async def test_single_producer_mode(self, exchange, state_service, test_order):
+        """单生产者模式省略执行锁"""
+        await exchange.connect()
+        await state_service.initialize()
+        await state_service.state_machine.become_eligible("测试")
+        engine = ExecutionEngine(exchange, state_service, single_producer=True)
+        
+        result = await engine.execute_order(test_order)
+        
+        assert result.status == OrderStatus.FILLED
+    
+    @pytest.mark.asyncio
+    async def test_order_shards(self, engine, exchange, state_service, test_order):
+        """同一交易对始终映射到同一分片锁"""
+        sharded = ExecutionEngine(exchange, state_service, order_shards=4)
+        
+        assert len(sharded._shard_locks) == 4
+        assert sharded._lock_for("BTCUSDT") is sharded._lock_for("BTCUSDT")
+        
+        result = await sharded.execute_order(test_order)
+        assert result.status == OrderStatus.FILLED
+        
+        with pytest.raises(ValueError):
+            ExecutionEngine(exchange, state_service, order_shards=0)
+    
+    def test_high_window_direction(self, exchange, state_service, test_order):
+        """方向一致才应用放大系数"""
+        engine = ExecutionEngine(exchange, state_service)
+        
+        engine.set_high_trading_window(True, confidence=0.8, direction="long")
+        assert engine._apply_high_window_multiplier(test_order).quantity > test_order.quantity
+        
+        engine.set_high_trading_window(True, confidence=0.8, direction="short")
+        assert engine._apply_high_window_multiplier(test_order) is test_order
@@ -0,0 +1,167 @@
+"""交易所管理器测试"""
+
+import asyncio
+
+import pytest
+
+from src.common.enums import OrderSide, OrderStatus
+from src.common.models import Order
+from src.core.execution.exchange import BinanceClient, CircuitState, ExchangeManager
+from backend.tests.mocks.exchange import MockExchangeClient
+
+
+@pytest.fixture
+def primary():
+    return MockExchangeClient()
+
+
+@pytest.fixture
+def backup():
+    return MockExchangeClient()
+
+
+@pytest.fixture
+def manager(primary, backup):
+    return ExchangeManager(primary, backup)
+
+
+class TestExchangeManagerConnection:
+    """连接管理测试"""
+    
+    @pytest.mark.asyncio
+    async def test_connect_both(self, manager, primary, backup):
+        """主备同时连接"""
+        await manager.connect()
+        
+        assert primary.is_connected
+        assert backup.is_connected
+    
+    @pytest.mark.asyncio
+    async def test_disconnect_failure_isolated(self, manager, primary, backup):
+        """主交易所断开失败不影响备用断开"""
+        await manager.connect()
+        
+        async def disconnect():
+            raise RuntimeError("断开失败")
+        
+        primary.disconnect = disconnect
+        
+        await manager.disconnect()
+        
+        assert not backup.is_connected
+    
+    @pytest.mark.asyncio
+    async def test_binance_clients_share_http_pool(self):
+        """主备均为 Binance 时共用一个 HTTP 连接池"""
+        primary = BinanceClient(api_key="a", api_secret="a")
+        backup = BinanceClient(api_key="b", api_secret="b", testnet=True)
+        manager = ExchangeManager(primary, backup)
+        
+        await manager.connect()
+        shared = BinanceClient.get_shared_client()
+        
+        assert shared is not None
+        assert primary._client is shared
+        assert backup._client is shared
+        
+        await manager.disconnect()
+        
+        assert BinanceClient.get_shared_client() is None
+        assert shared.is_closed
+
+
+class TestExchangeManagerCircuit:
+    """熔断测试"""
+    
+    @pytest.mark.asyncio
+    async def test_failover_after_threshold(self, manager, primary, backup):
+        """同一方法连续失败达到阈值后切到备用"""
+        primary.set_should_fail(True)
+        
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await manager.place_order(Order(order_id="o1", side=OrderSide.BUY, quantity=0.1, strategy_id="test"))
+        
+        result = await manager.place_order(Order(order_id="o2", side=OrderSide.BUY, quantity=0.1, strategy_id="test"))
+        
+        assert result.status == OrderStatus.FILLED
+        assert manager.circuit_state == CircuitState.OPEN
+        assert manager.current_client is backup
+    
+    @pytest.mark.asyncio
+    async def test_failures_counted_per_method(self, manager, primary):
+        """不同方法的失败不累加"""
+        async def fail(*args):
+            raise RuntimeError("请求失败")
+        
+        primary.get_balance = fail
+        primary.get_position = fail
+        
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await manager.get_balance()
+            with pytest.raises(RuntimeError):
+                await manager.get_position("BTCUSDT")
+        
+        assert manager.circuit_state == CircuitState.CLOSED
+    
+    @pytest.mark.asyncio
+    async def test_half_open_probe_recovers(self, manager, primary, backup):
+        """冷却结束后探测成功自动切回主交易所"""
+        manager._switch_to_backup()
+        assert manager.current_client is backup
+        
+        manager._open_until = 0.0
+        await manager.get_balance()
+        
+        assert manager.circuit_state == CircuitState.CLOSED
+        assert manager.current_client is primary
+    
+    @pytest.mark.asyncio
+    async def test_half_open_probe_failure_reopens(self, manager, primary):
+        """探测失败时重新熔断，本次请求由备用完成"""
+        manager._switch_to_backup()
+        manager._open_until = 0.0
+        primary.set_should_fail(True)
+        
+        result = await manager.place_order(Order(order_id="o1", side=OrderSide.BUY, quantity=0.1, strategy_id="test"))
+        
+        assert result.status == OrderStatus.FILLED
+        assert manager.circuit_state == CircuitState.OPEN
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_released(self, manager, primary, backup):
+        """探测请求被取消时释放探测名额，冷却后重新探测主交易所"""
+        manager._switch_to_backup()
+        manager._open_until = 0.0
+        
+        started = asyncio.Event()
+        
+        async def hang():
+            started.set()
+            await asyncio.Event().wait()
+        
+        original = primary.get_balance
+        primary.get_balance = hang
+        
+        task = asyncio.create_task(manager.get_balance())
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        
+        assert manager.circuit_state == CircuitState.OPEN
+        assert manager._probe_in_flight is False
+        
+        calls = []
+        
+        async def probe():
+            calls.append("primary")
+            return await original()
+        
+        primary.get_balance = probe
+        manager._open_until = 0.0
+        await manager.get_balance()
+        
+        assert calls == ["primary"]
+        assert manager.circuit_state == CircuitState.CLOSED
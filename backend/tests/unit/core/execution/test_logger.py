@@ -0,0 +1,104 @@
+"""执行日志器测试"""
+
+import asyncio
+import logging
+
+import pytest
+
+from src.common.enums import OrderSide, OrderStatus
+from src.common.models import Order
+from src.core.execution.constants import ExecutionConstants
+from src.core.execution.logger import ExecutionLogger
+
+
+class TestExecutionLogger:
+    """执行日志器测试"""
+    
+    def test_recent_logs_bounded(self, monkeypatch):
+        """日志超出容量时淘汰最旧条目"""
+        monkeypatch.setattr(ExecutionConstants, "MAX_LOG_ENTRIES", 3)
+        exec_logger = ExecutionLogger()
+        
+        for i in range(5):
+            exec_logger.log_order_rejected(f"order_{i}", "测试")
+        
+        assert [e.order_id for e in exec_logger.get_recent_logs()] == ["order_2", "order_3", "order_4"]
+        assert [e.order_id for e in exec_logger.get_recent_logs(limit=2)] == ["order_3", "order_4"]
+        assert exec_logger.get_recent_logs(limit=0) == []
+    
+    def test_order_history_bounded(self, monkeypatch):
+        """按订单索引的日志限制订单数与每单条目数"""
+        monkeypatch.setattr(ExecutionConstants, "MAX_TRACKED_ORDER_LOGS", 2)
+        monkeypatch.setattr(ExecutionConstants, "MAX_LOG_ENTRIES_PER_ORDER", 2)
+        exec_logger = ExecutionLogger()
+        
+        for _ in range(3):
+            exec_logger.log_order_cancelled("order_0", "测试")
+        exec_logger.log_order_cancelled("order_1", "测试")
+        exec_logger.log_order_cancelled("order_2", "测试")
+        
+        assert exec_logger.get_order_history("order_0") == []
+        assert len(exec_logger.get_order_history("order_1")) == 1
+        assert len(exec_logger.get_order_history("order_2")) == 1
+    
+    @pytest.mark.asyncio
+    async def test_emit_batched_on_loop(self, monkeypatch):
+        """事件循环中日志排队，下一轮循环批量输出"""
+        monkeypatch.setattr(ExecutionConstants, "LOG_QUEUE_HIGH_WATERMARK", 2)
+        exec_logger = ExecutionLogger()
+        
+        for i in range(3):
+            exec_logger.log_order_cancelled(f"order_{i}", "测试")
+        exec_logger.log_execution_error("order_3", "测试")
+        
+        # 第 3 条 INFO 超过高水位被丢弃，ERROR 始终保留；审计条目不受影响
+        assert len(exec_logger._pending) == 3
+        assert exec_logger.dropped_count == 1
+        assert len(exec_logger.get_recent_logs()) == 4
+        
+        await asyncio.sleep(0)
+        
+        assert len(exec_logger._pending) == 0
+        assert exec_logger.dropped_count == 0
+    
+    def test_log_ids_unique_across_loggers(self):
+        """多个日志器生成的日志 ID 互不重复"""
+        loggers = [ExecutionLogger(), ExecutionLogger()]
+        for exec_logger in loggers:
+            for i in range(3):
+                exec_logger.log_order_cancelled(f"order_{i}", "测试")
+        
+        log_ids = [e.log_id for exec_logger in loggers for e in exec_logger.get_recent_logs()]
+        assert len(set(log_ids)) == 6
+    
+    def test_details_built_on_read(self):
+        """详情按需从订单/执行结果生成"""
+        exec_logger = ExecutionLogger()
+        order = Order(order_id="order_0", side=OrderSide.BUY, quantity=0.1, price=50000.0, strategy_id="test")
+        
+        exec_logger.log_order_submitted(order)
+        exec_logger.log_order_rejected("order_0", "仓位超限")
+        
+        submitted, rejected = exec_logger.get_order_history("order_0")
+        assert submitted.details["side"] == OrderSide.BUY.value
+        assert submitted.details["quantity"] == 0.1
+        assert rejected.details == {"reason": "仓位超限"}
+        assert rejected.to_dict()["status"] == OrderStatus.REJECTED.value
+    
+    def test_emitted_record_fields(self):
+        """输出的日志记录带订单 ID 与事件类型"""
+        records: list[logging.LogRecord] = []
+        handler = logging.Handler()
+        handler.emit = records.append
+        module_logger = logging.getLogger("src.core.execution.logger")
+        module_logger.addHandler(handler)
+        try:
+            ExecutionLogger().log_order_rejected("order_0", "仓位超限")
+        finally:
+            module_logger.removeHandler(handler)
+        
+        (record,) = records
+        assert record.levelno == logging.WARNING
+        assert record.getMessage() == "订单拒绝: order_0, 原因: 仓位超限"
+        assert record.order_id == "order_0"
+        assert record.event == "ORDER_REJECTED"
@@ -0,0 +1,156 @@
+"""多用户执行器测试"""
+
+import asyncio
+
+import pytest
+
+from src.core.execution.multi_executor import MultiUserExecutor
+from src.user.context import TradingSignal, UserExecutionResult
+from src.user.models import UserRiskState
+
+
+class FakeContext:
+    """只实现广播所需接口的用户上下文"""
+    
+    def __init__(self, user_id: str, delay: float = 0.0, error: BaseException | None = None):
+        self.user_id = user_id
+        self.is_tradeable = True
+        self.is_initialized = True
+        self.risk_state = UserRiskState(user_id=user_id)
+        self._delay = delay
+        self._error = error
+    
+    async def execute_signal(self, signal: TradingSignal) -> UserExecutionResult:
+        await asyncio.sleep(self._delay)
+        if self._error:
+            raise self._error
+        return UserExecutionResult(user_id=self.user_id, signal_id=signal.signal_id, success=True)
+    
+    async def close_position(self, symbol: str) -> UserExecutionResult:
+        await asyncio.sleep(self._delay)
+        if self._error:
+            raise self._error
+        return UserExecutionResult(user_id=self.user_id, signal_id="close_all", success=True)
+    
+    async def shutdown(self) -> None:
+        await asyncio.sleep(self._delay)
+        if self._error:
+            raise self._error
+
+
+@pytest.fixture
+def signal():
+    return TradingSignal(
+        signal_id="sig_001",
+        symbol="BTCUSDT",
+        direction="long",
+        confidence=0.8,
+        position_pct=0.1,
+    )
+
+
+def make_executor(*contexts: FakeContext) -> MultiUserExecutor:
+    executor = MultiUserExecutor(user_manager=None)
+    executor._contexts = {c.user_id: c for c in contexts}
+    executor._initialized = True
+    return executor
+
+
+class TestMultiUserExecutor:
+    """多用户执行器测试"""
+    
+    @pytest.mark.asyncio
+    async def test_broadcast_runs_concurrently(self, signal):
+        """各用户并发执行，总耗时接近单用户耗时"""
+        executor = make_executor(*(FakeContext(f"user_{i}", delay=0.05) for i in range(5)))
+        
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        result = await executor.broadcast_signal(signal)
+        elapsed = loop.time() - started
+        
+        assert result.success_count == 5
+        assert elapsed < 0.2
+    
+    @pytest.mark.asyncio
+    async def test_broadcast_isolates_failures(self, signal):
+        """单用户异常不影响其他用户"""
+        executor = make_executor(
+            FakeContext("user_ok"),
+            FakeContext("user_bad", error=RuntimeError("交易所错误")),
+        )
+        
+        result = await executor.broadcast_signal(signal)
+        
+        assert result.success_count == 1
+        assert result.failed_count == 1
+        assert result.results["user_bad"].error == "交易所错误"
+    
+    @pytest.mark.asyncio
+    async def test_broadcast_deadline_cancels_stragglers(self, signal):
+        """超过广播截止时间的用户被取消并记为超时"""
+        slow = FakeContext("user_slow", delay=10)
+        executor = make_executor(FakeContext("user_fast"), slow)
+        executor._execution_timeout = 0.05
+        
+        result = await executor.broadcast_signal(signal)
+        
+        assert result.success_count == 1
+        assert result.results["user_slow"].error == "执行超时"
+        assert not [
+            t for t in asyncio.all_tasks()
+            if t is not asyncio.current_task() and not t.done()
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_close_all_positions_concurrently(self):
+        """并行平仓，单用户异常不影响其他用户"""
+        executor = make_executor(
+            *(FakeContext(f"user_{i}", delay=0.05) for i in range(4)),
+            FakeContext("user_bad", error=RuntimeError("平仓失败")),
+        )
+        
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        results = await executor.close_all_positions()
+        elapsed = loop.time() - started
+        
+        assert elapsed < 0.2
+        assert sum(r.success for r in results.values()) == 4
+        assert results["user_bad"].error == "平仓失败"
+    
+    @pytest.mark.asyncio
+    async def test_close_all_positions_cancelled_user(self):
+        """单用户平仓任务被取消时记为失败结果"""
+        executor = make_executor(
+            FakeContext("user_ok"),
+            FakeContext("user_cancelled", error=asyncio.CancelledError()),
+        )
+        
+        results = await executor.close_all_positions()
+        
+        assert results["user_ok"].success
+        assert isinstance(results["user_cancelled"], UserExecutionResult)
+        assert not results["user_cancelled"].success
+        assert results["user_cancelled"].error == "执行已取消"
+    
+    @pytest.mark.asyncio
+    async def test_shutdown_all(self):
+        """关闭异常不影响其他用户，最终清空上下文"""
+        executor = make_executor(FakeContext("user_ok"), FakeContext("user_bad", error=RuntimeError("关闭失败")))
+        
+        await executor.shutdown_all()
+        
+        assert executor.total_count == 0
+    
+    def test_get_all_status(self):
+        """汇总状态与逐个用户状态一致"""
+        idle = FakeContext("user_idle")
+        idle.is_tradeable = False
+        executor = make_executor(FakeContext("user_active"), idle)
+        
+        status = executor.get_all_status()
+        
+        assert status["total_users"] == 2
+        assert status["active_users"] == 1
+        assert status["users"]["user_idle"] == executor.get_user_status("user_idle")
@@ -1,5 +1,8 @@
 """订单管理器测试"""
 
+import asyncio
+import time
+
 import pytest
 
 from src.common.enums import OrderSide, OrderStatus
@@ -101,3 +104,167 @@ class TestOrderManager:
         await manager.mark_completed(test_order.order_id, OrderStatus.FILLED)
         
         assert manager.pending_count == 0
+    
+    @pytest.mark.asyncio
+    async def test_cancel_all_partial_failure(self, manager, mock_client):
+        """批量撤销部分失败时保留未撤销订单"""
+        for i in range(2):
+            await manager.submit_order(Order(
+                order_id=f"test_{i}",
+                side=OrderSide.BUY,
+                quantity=0.1,
+                strategy_id="test",
+            ))
+        
+        async def cancel_orders_batch(order_ids, symbol):
+            return [order_id == "test_0" for order_id in order_ids]
+        
+        mock_client.cancel_orders_batch = cancel_orders_batch
+        
+        cancelled = await manager.cancel_all_pending("测试")
+        
+        assert cancelled == 1
+        assert manager.pending_count == 1
+        assert manager.get_order("test_0").status == OrderStatus.CANCELLED
+    
+    @pytest.mark.asyncio
+    async def test_check_timeouts(self, manager, monkeypatch):
+        """超时订单只返回仍待处理的，且每个只返回一次"""
+        for i in range(3):
+            await manager.submit_order(Order(
+                order_id=f"test_{i}",
+                side=OrderSide.BUY,
+                quantity=0.1,
+                strategy_id="test",
+            ))
+        await manager.mark_completed("test_1", OrderStatus.FILLED)
+        
+        assert await manager.check_timeouts() == []
+        
+        later = time.time_ns() + manager._timeout_ns + 1_000_000_000
+        monkeypatch.setattr("src.core.execution.order_manager.time.time_ns", lambda: later)
+        
+        assert sorted(await manager.check_timeouts()) == ["test_0", "test_2"]
+        assert await manager.check_timeouts() == []
+    
+    @pytest.mark.asyncio
+    async def test_submit_not_blocked_by_cancel(self, manager, mock_client, test_order):
+        """撤单等待交易所响应时不阻塞其他订单提交"""
+        await manager.submit_order(test_order)
+        
+        release = asyncio.Event()
+        
+        async def cancel_order(order_id, symbol):
+            await release.wait()
+            return True
+        
+        mock_client.cancel_order = cancel_order
+        cancel_task = asyncio.create_task(manager.cancel_order(test_order.order_id, "测试"))
+        await asyncio.sleep(0)
+        
+        await asyncio.wait_for(
+            manager.submit_order(Order(order_id="test_other", side=OrderSide.BUY, quantity=0.1, strategy_id="test")),
+            timeout=1,
+        )
+        
+        release.set()
+        assert await cancel_task
+        assert manager.pending_count == 1
+        assert manager._order_locks == {}
+    
+    @pytest.mark.asyncio
+    async def test_cancel_all_symbol_failure_isolated(self, manager, mock_client):
+        """单个交易对批量撤单失败不影响其他交易对"""
+        for i, symbol in enumerate(["BTCUSDT", "ETHUSDT"]):
+            await manager.submit_order(Order(
+                order_id=f"test_{i}",
+                symbol=symbol,
+                side=OrderSide.BUY,
+                quantity=0.1,
+                strategy_id="test",
+            ))
+        
+        async def cancel_orders_batch(order_ids, symbol):
+            if symbol == "ETHUSDT":
+                raise RuntimeError("撤单失败")
+            return [True] * len(order_ids)
+        
+        mock_client.cancel_orders_batch = cancel_orders_batch
+        
+        cancelled = await manager.cancel_all_pending("测试")
+        
+        assert cancelled == 1
+        assert manager.get_order("test_1").status != OrderStatus.CANCELLED
+    
+    @pytest.mark.asyncio
+    async def test_poll_pending(self, manager, mock_client):
+        """批量轮询状态，终态订单标记完成"""
+        orders = [
+            Order(order_id=f"test_{i}", side=OrderSide.BUY, quantity=0.1, strategy_id="test")
+            for i in range(2)
+        ]
+        for order in orders:
+            await manager.submit_order(order)
+        await mock_client.place_order(orders[0])
+        
+        statuses = await manager.poll_pending()
+        
+        assert statuses == {"test_0": OrderStatus.FILLED, "test_1": OrderStatus.PENDING}
+        assert manager.get_order("test_0").status == OrderStatus.FILLED
+        assert manager.pending_count == 1
+        assert manager._pending_orders["test_1"].check_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_lock_reclaimed_after_failed_cancel(self, manager, mock_client, test_order):
+        """撤单失败后订单经其他途径完成时回收撤单锁"""
+        await manager.submit_order(test_order)
+        
+        async def cancel_order(order_id, symbol):
+            return False
+        
+        mock_client.cancel_order = cancel_order
+        
+        assert not await manager.cancel_order(test_order.order_id, "测试")
+        assert test_order.order_id in manager._order_locks
+        
+        await manager.mark_completed(test_order.order_id, OrderStatus.FILLED)
+        
+        assert manager._order_locks == {}
+        assert not await manager.cancel_order("unknown", "测试")
+        assert manager._order_locks == {}
+    
+    @pytest.mark.asyncio
+    async def test_cancel_all_skips_order_being_cancelled(self, manager, mock_client):
+        """批量撤销跳过正在单独撤销的订单，不重复发送撤单"""
+        for i in range(2):
+            await manager.submit_order(Order(
+                order_id=f"test_{i}",
+                side=OrderSide.BUY,
+                quantity=0.1,
+                strategy_id="test",
+            ))
+        
+        release = asyncio.Event()
+        batch_ids: list[str] = []
+        
+        async def cancel_order(order_id, symbol):
+            await release.wait()
+            return True
+        
+        async def cancel_orders_batch(order_ids, symbol):
+            batch_ids.extend(order_ids)
+            return [True] * len(order_ids)
+        
+        mock_client.cancel_order = cancel_order
+        mock_client.cancel_orders_batch = cancel_orders_batch
+        
+        cancel_task = asyncio.create_task(manager.cancel_order("test_0", "测试"))
+        await asyncio.sleep(0)
+        
+        assert await manager.cancel_all_pending("测试") == 1
+        assert batch_ids == ["test_1"]
+        
+        release.set()
+        assert await cancel_task
+        assert manager.pending_count == 0
+        assert manager._order_locks == {}
@@ -1,9 +1,12 @@
 """仓位管理器测试"""
 
+import asyncio
+
 import pytest
 
 from src.common.enums import OrderSide
 from src.common.models import Order
+from src.core.execution.constants import ExecutionConstants
 from src.core.execution.exchange import ExchangeManager, Position
 from src.core.execution.position_manager import PositionManager
 from backend.tests.mocks.exchange import MockExchangeClient
@@ -96,3 +99,58 @@ class TestPositionManager:
         ratio = manager.get_position_ratio()
         
         assert ratio == 0.05  # 5000 / 100000
+    
+    @pytest.mark.asyncio
+    async def test_check_position_limit_exceed_total(self, manager, mock_client):
+        """已有仓位加新订单超过总仓位限制；市价单按持仓均价估算"""
+        mock_client.set_position(Position(
+            symbol="BTCUSDT",
+            side="LONG",
+            quantity=0.58,  # 29000 USDT = 29%
+            entry_price=50000.0,
+        ))
+        order = Order(
+            order_id="test",
+            side=OrderSide.BUY,
+            quantity=0.04,  # 2000 USDT = 2%
+            strategy_id="test",
+        )
+        
+        passed, reason = await manager.check_position_limit(order)
+        
+        assert not passed
+        assert "总仓位" in reason
+    
+    @pytest.mark.asyncio
+    async def test_sync_interval(self, manager):
+        """同步间隔内复用缓存，超过间隔后重新同步"""
+        await manager.get_current_position()
+        assert not manager._should_sync()
+        
+        manager._last_sync -= ExecutionConstants.POSITION_SYNC_INTERVAL + 1
+        assert manager._should_sync()
+    
+    @pytest.mark.asyncio
+    async def test_cached_read_skips_lock(self, manager):
+        """缓存有效时读取不等待锁"""
+        await manager.get_current_position()
+        
+        async with manager._lock:
+            position = await asyncio.wait_for(manager.get_current_position(), timeout=1)
+        
+        assert position.symbol == "BTCUSDT"
+    
+    @pytest.mark.asyncio
+    async def test_check_position_limit_market_order_no_position(self, manager):
+        """无持仓时的市价单无法估值，直接通过"""
+        order = Order(
+            order_id="test",
+            side=OrderSide.BUY,
+            quantity=10.0,
+            strategy_id="test",
+        )
+        
+        passed, reason = await manager.check_position_limit(order)
+        
+        assert passed
+        assert reason == "通过"
@@ -0,0 +1,111 @@
+"""止盈止损管理器测试"""
+
+import pytest
+
+from src.core.execution.stop_manager import StopConfig, StopManager, TriggerType
+
+
+@pytest.fixture
+def manager():
+    return StopManager()
+
+
+class TestStopManager:
+    """止盈止损管理器测试"""
+    
+    def test_side_sign_derived_from_side(self):
+        """直接构建配置时方向符号由 side 派生"""
+        assert StopConfig(position_id="p1", symbol="BTCUSDT", side="LONG", entry_price=100).side_sign == 1
+        assert StopConfig(position_id="p2", symbol="BTCUSDT", side="SHORT", entry_price=100).side_sign == -1
+    
+    @pytest.mark.parametrize("side, stop_price, safe_price", [
+        ("LONG", 95.0, 96.0),
+        ("SHORT", 105.0, 104.0),
+    ])
+    def test_stop_loss(self, manager, side, stop_price, safe_price):
+        """止损按方向触发"""
+        manager.set_stop_loss("p1", "BTCUSDT", side, 100.0, stop_price)
+        
+        assert manager.check_triggers({"BTCUSDT": safe_price}) == []
+        
+        events = manager.check_triggers({"BTCUSDT": stop_price})
+        
+        assert len(events) == 1
+        assert events[0].position_id == "p1"
+        assert events[0].trigger_type == TriggerType.STOP_LOSS
+        assert events[0].trigger_price == stop_price
+        assert events[0].current_price == stop_price
+    
+    @pytest.mark.parametrize("side, target_price, below_target", [
+        ("LONG", 110.0, 109.0),
+        ("SHORT", 90.0, 91.0),
+    ])
+    def test_take_profit(self, manager, side, target_price, below_target):
+        """止盈按方向触发"""
+        manager.set_take_profit("p1", "BTCUSDT", side, 100.0, target_price)
+        
+        assert manager.check_triggers({"BTCUSDT": below_target}) == []
+        
+        events = manager.check_triggers({"BTCUSDT": target_price})
+        
+        assert [e.trigger_type for e in events] == [TriggerType.TAKE_PROFIT]
+    
+    @pytest.mark.parametrize("side, extreme, trailing_price, pullback", [
+        ("LONG", 110.0, 104.5, 104.0),
+        ("SHORT", 90.0, 94.5, 95.0),
+    ])
+    def test_trailing_stop(self, manager, side, extreme, trailing_price, pullback):
+        """追踪止损跟随最有利价格，回撤超过百分比时触发"""
+        manager.set_trailing_stop("p1", "BTCUSDT", side, 100.0, 0.05)
+        
+        assert manager.check_triggers({"BTCUSDT": extreme}) == []
+        assert manager._configs["p1"].extreme_price == extreme
+        
+        events = manager.check_triggers({"BTCUSDT": pullback})
+        
+        assert len(events) == 1
+        assert events[0].trigger_type == TriggerType.TRAILING_STOP
+        assert events[0].trigger_price == pytest.approx(trailing_price)
+        assert manager._configs["p1"].extreme_price == extreme
+    
+    def test_symbols_without_quote_skipped(self, manager):
+        """只检查有报价的交易对，其他交易对的配置（含追踪极值）不受影响"""
+        manager.set_stop_loss("p1", "BTCUSDT", "LONG", 100.0, 95.0)
+        manager.set_trailing_stop("p2", "ETHUSDT", "LONG", 3000.0, 0.05)
+        
+        events = manager.check_triggers({"ETHUSDT": 3100.0, "SOLUSDT": 1.0})
+        
+        assert events == []
+        assert manager._configs["p2"].extreme_price == 3100.0
+        
+        events = manager.check_triggers({"BTCUSDT": 90.0})
+        
+        assert [e.position_id for e in events] == ["p1"]
+        assert manager._configs["p2"].extreme_price == 3100.0
+    
+    def test_existing_config_updated(self, manager):
+        """同一仓位再次设置时更新原配置，不重复登记"""
+        manager.set_stop_loss("p1", "BTCUSDT", "LONG", 100.0, 95.0)
+        manager.set_take_profit("p1", "BTCUSDT", "LONG", 100.0, 110.0)
+        
+        assert list(manager._by_symbol["BTCUSDT"]) == ["p1"]
+        
+        events = manager.check_triggers({"BTCUSDT": 110.0})
+        
+        assert [e.trigger_type for e in events] == [TriggerType.TAKE_PROFIT]
+    
+    def test_remove_config_cleans_index(self, manager):
+        """移除配置同时清理交易对索引"""
+        manager.set_stop_loss("p1", "BTCUSDT", "LONG", 100.0, 95.0)
+        manager.set_stop_loss("p2", "BTCUSDT", "SHORT", 100.0, 105.0)
+        
+        manager.remove_config("p1")
+        
+        assert list(manager._by_symbol["BTCUSDT"]) == ["p2"]
+        
+        manager.remove_config("p2")
+        manager.remove_config("unknown")
+        
+        assert manager._configs == {}
+        assert manager._by_symbol == {}
+        assert manager.check_triggers({"BTCUSDT": 90.0}) == []
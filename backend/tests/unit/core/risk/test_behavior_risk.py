@@ -0,0 +1,82 @@
+"""行为风控测试"""
+
+import pytest
+
+from src.common.enums import RiskLevel
+from src.core.risk.base import RiskContext, TradeRecord
+from src.core.risk.behavior_risk import BehaviorRiskChecker
+
+
+@pytest.fixture
+def checker():
+    return BehaviorRiskChecker()
+
+
+def make_trades(directions: list[str]) -> list[TradeRecord]:
+    return [
+        TradeRecord(
+            trade_id=f"t{i}",
+            strategy_id="test",
+            direction=direction,
+            quantity=0.1,
+            entry_price=50000,
+        )
+        for i, direction in enumerate(directions)
+    ]
+
+
+class TestBehaviorRiskChecker:
+    """行为风控检查器测试"""
+    
+    def test_direction_counts_derived(self):
+        """未传入方向计数时由 recent_trades 统计"""
+        context = RiskContext(
+            equity=100000,
+            initial_equity=100000,
+            drawdown=0.0,
+            daily_pnl=0,
+            recent_trades=make_trades(["long", "long", "short"]),
+        )
+        assert context.long_count == 2
+        assert context.short_count == 1
+    
+    def test_direction_counts_must_be_paired(self):
+        """只传入一个方向计数时拒绝构建"""
+        with pytest.raises(ValueError):
+            RiskContext(
+                equity=100000,
+                initial_equity=100000,
+                drawdown=0.0,
+                daily_pnl=0,
+                long_count=9,
+            )
+    
+    @pytest.mark.asyncio
+    async def test_balanced_directions_approve(self, checker):
+        """方向均衡时批准"""
+        context = RiskContext(
+            equity=100000,
+            initial_equity=100000,
+            drawdown=0.0,
+            daily_pnl=0,
+            recent_trades=make_trades(["long", "short"]),
+        )
+        result = await checker.check(context)
+        assert result.approved is True
+        assert result.level == RiskLevel.NORMAL
+    
+    @pytest.mark.asyncio
+    async def test_direction_concentration_warning(self, checker):
+        """方向集中度过高时预警"""
+        context = RiskContext(
+            equity=100000,
+            initial_equity=100000,
+            drawdown=0.0,
+            daily_pnl=0,
+            long_count=9,
+            short_count=1,
+        )
+        result = await checker.check(context)
+        assert result.approved is True
+        assert result.level == RiskLevel.WARNING
+        assert len(result.events) == 1
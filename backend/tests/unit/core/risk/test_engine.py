@@ -1,9 +1,12 @@
 """风控引擎测试"""
 
+from datetime import timedelta
+
 import pytest
 
 from src.common.enums import RiskLevel
-from src.core.risk.engine import RiskControlEngine
+from src.common.utils import utc_now
+from src.core.risk.engine import RiskControlEngine, WitnessCorrelationCalculator
 from src.core.risk.base import RiskContext
 
 
@@ -69,6 +72,24 @@ class TestRiskControlEngine:
         assert engine.is_cooldown
         assert engine.current_level == RiskLevel.COOLDOWN
     
+    @pytest.mark.asyncio
+    async def test_checker_exception_rejects(self, engine, normal_context):
+        """检查器异常时保守拒绝"""
+        from src.core.risk.base import RiskChecker
+        
+        class FailingChecker(RiskChecker):
+            @property
+            def name(self) -> str:
+                return "failing"
+            
+            async def check(self, context):
+                raise RuntimeError("boom")
+        
+        engine.add_checker(FailingChecker())
+        result = await engine.check_permission(normal_context)
+        assert result.approved is False
+        assert "failing" in result.reason
+    
     def test_add_remove_checker(self, engine):
         """添加和移除检查器"""
         initial_count = len(engine._checkers)
@@ -102,3 +123,62 @@ class TestRiskLevelPriority:
         assert engine._level_priority(RiskLevel.WARNING) == 1
         assert engine._level_priority(RiskLevel.COOLDOWN) == 2
         assert engine._level_priority(RiskLevel.RISK_LOCKED) == 3
+
+
+class TestWitnessCorrelationCalculator:
+    """证人相关性计算器测试"""
+    
+    def test_insufficient_samples(self):
+        """样本不足时无相关"""
+        calc = WitnessCorrelationCalculator()
+        now = utc_now()
+        for i in range(10):
+            calc.record_signal("a", now + timedelta(minutes=i), "long", True)
+            calc.record_signal("b", now + timedelta(minutes=i), "long", True)
+        assert calc.calculate_correlation("a", "b") == 0.0
+    
+    def test_correlation(self):
+        """一小时窗口内方向与结果一致的比例"""
+        calc = WitnessCorrelationCalculator()
+        start = utc_now()
+        for i in range(30):
+            ts = start + timedelta(hours=2 * i)
+            calc.record_signal("a", ts, "long", True)
+            calc.record_signal("b", ts + timedelta(minutes=10), "long", i % 2 == 0)
+            calc.record_signal("c", ts, "long", True)
+        
+        assert calc.calculate_correlation("a", "b") == pytest.approx(0.5)
+        assert calc.calculate_correlation("a", "c") == 1.0
+    
+    def test_correlation_risk(self):
+        """高相关证人过多时拒绝"""
+        calc = WitnessCorrelationCalculator()
+        start = utc_now()
+        for i in range(30):
+            ts = start + timedelta(hours=2 * i)
+            for witness_id in ("a", "b", "c"):
+                calc.record_signal(witness_id, ts, "short", False)
+        
+        passed, reason, pairs = calc.check_correlation_risk(["a", "b", "c"])
+        assert passed is False
+        assert len(pairs) == 3
+    
+    def test_cache_invalidated_by_new_signals(self):
+        """新信号使缓存的相关性失效"""
+        calc = WitnessCorrelationCalculator()
+        start = utc_now()
+        for i in range(30):
+            ts = start + timedelta(hours=2 * i)
+            calc.record_signal("a", ts, "long", True)
+            calc.record_signal("b", ts, "long", True)
+        
+        _, _, pairs = calc.check_correlation_risk(["a", "b"])
+        assert pairs == [("a", "b", 1.0)]
+        
+        for i in range(30, 60):
+            ts = start + timedelta(hours=2 * i)
+            calc.record_signal("a", ts, "long", True)
+            calc.record_signal("b", ts, "short", True)
+        
+        _, _, pairs = calc.check_correlation_risk(["a", "b"])
+        assert pairs == []